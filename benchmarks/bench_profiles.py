@@ -0,0 +1,83 @@
+# Per-request latency and memory of the home and details pages under each settings profile.
+# Every profile runs in its own process, since settings are read once at startup.
+# Run from the project root: python benchmarks/bench_profiles.py
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROFILES = ['development', 'production']
+REQUESTS = 100
+TRACED_REQUESTS = 10
+WARMUP = 10
+
+
+def run_profile():
+    import statistics
+    import time
+    import tracemalloc
+    from datetime import timedelta
+    import django
+
+    sys.path.insert(0, ROOT)
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'event_management.settings')
+    django.setup()
+
+    from django.conf import settings
+    from django.core.management import call_command
+    from django.db import connection
+    from django.test import Client
+    from django.utils import timezone
+    from events.models import Category, Event
+
+    call_command('migrate', verbosity=0)
+    if not Event.objects.exists():
+        category = Category.objects.create(name='Bench', description='')
+        Event.objects.bulk_create([
+            Event(name=f'Event {i}', description='Benchmark event', starts_at=timezone.now() + timedelta(days=i % 30),
+                  location='DHAKA', category=category)
+            for i in range(100)
+        ])
+    event_id = Event.objects.values_list('id', flat=True).first()
+
+    client = Client()
+    for path in ('/', f'/event/{event_id}/'):
+        for _ in range(WARMUP):
+            client.get(path)
+
+        # latency untraced, then allocations on a shorter traced pass (tracemalloc slows every call)
+        latencies, allocated = [], []
+        for _ in range(REQUESTS):
+            started = time.perf_counter()
+            response = client.get(path)
+            latencies.append((time.perf_counter() - started) * 1000)
+
+        tracemalloc.start()
+        for _ in range(TRACED_REQUESTS):
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            client.get(path)
+            allocated.append(tracemalloc.get_traced_memory()[1] - before)
+        tracemalloc.stop()
+
+        latencies.sort()
+        print(
+            f"{os.environ['DJANGO_ENV']:<12} {path:<14} {response.status_code:>4} {int(settings.DEBUG):>5} "
+            f"{statistics.median(latencies):>9.2f} {latencies[int(len(latencies) * 0.95)]:>9.2f} "
+            f"{statistics.median(allocated) / 1024:>10.1f} {len(connection.queries):>8}"
+        )
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1 and sys.argv[1] == '--child':
+        run_profile()
+        sys.exit()
+
+    print(f"{'profile':<12} {'path':<14} {'code':>4} {'debug':>5} {'p50 ms':>9} {'p95 ms':>9} {'peak KiB':>10} {'queries':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        database_url = os.environ.get('BENCH_DATABASE_URL', f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        for profile in PROFILES:
+            env = dict(os.environ, DJANGO_ENV=profile, DATABASE_URL=database_url)
+            env.pop('DEBUG', None)
+            subprocess.run([sys.executable, os.path.abspath(__file__), '--child'], env=env, cwd=ROOT, check=True)
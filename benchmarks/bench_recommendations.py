@@ -0,0 +1,32 @@
+# Build time of the co-RSVP similarity vs number of RSVPs, on synthetic data.
+# Run from the project root: python benchmarks/bench_recommendations.py
+import os
+import sys
+import time
+import django
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'event_management.settings')
+django.setup()
+
+import numpy as np
+from events.recommendations import item_similarity, top_neighbors
+
+rng = np.random.default_rng(42)
+SIZES = [10_000, 100_000, 1_000_000]
+TOP_K = 10
+
+print(f"{'rsvps':>10} {'users':>8} {'events':>7} {'similarity':>11} {'top-k':>8} {'total':>8}")
+for rsvps in SIZES:
+    users = rsvps // 5
+    events = max(100, rsvps // 200)
+    # popularity is skewed like real events: a few get most RSVPs
+    event_ids = (rng.zipf(1.5, rsvps) % events).astype(np.int64)
+    user_ids = rng.integers(0, users, rsvps, dtype=np.int64)
+
+    started = time.perf_counter()
+    _, similarity = item_similarity(user_ids, event_ids)
+    built = time.perf_counter()
+    top_neighbors(similarity, TOP_K)
+    finished = time.perf_counter()
+    print(f"{rsvps:>10} {users:>8} {events:>7} {built - started:>10.3f}s {finished - built:>7.3f}s {finished - started:>7.3f}s")
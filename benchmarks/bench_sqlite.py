@@ -0,0 +1,95 @@
+# Concurrent RSVP writes on SQLite, default settings vs SQLITE_TUNED=True.
+# Every mode runs in its own process on its own database file (journal_mode=WAL sticks to the file).
+# Run from the project root: python benchmarks/bench_sqlite.py
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODES = [('default', '0'), ('tuned', '1')]
+WORKERS = 8
+RSVPS_PER_WORKER = 150
+EVENTS = 20
+
+
+def run_mode():
+    import statistics
+    import threading
+    import time
+    from datetime import timedelta
+    import django
+
+    sys.path.insert(0, ROOT)
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'event_management.settings')
+    django.setup()
+
+    from django.contrib.auth.models import User
+    from django.core.management import call_command
+    from django.db import OperationalError, connection, transaction
+    from django.utils import timezone
+    from events.models import Category, Event, RSVP
+
+    call_command('migrate', verbosity=0)
+    category = Category.objects.create(name='Bench', description='')
+    event_ids = [event.id for event in Event.objects.bulk_create([
+        Event(name=f'Event {i}', description='Benchmark event', starts_at=timezone.now() + timedelta(days=i),
+              category=category)
+        for i in range(EVENTS)
+    ])]
+    users = User.objects.bulk_create([User(username=f'bench{i}') for i in range(WORKERS * RSVPS_PER_WORKER)])
+    connection.close()
+
+    latencies, errors = [], []
+    lock = threading.Lock()
+
+    def worker(index):
+        mine = users[index * RSVPS_PER_WORKER:(index + 1) * RSVPS_PER_WORKER]
+        for n, user in enumerate(mine):
+            event_id = event_ids[(index + n) % EVENTS]
+            started = time.perf_counter()
+            try:
+                # what quick_rsvp does: read, then write, in one transaction
+                with transaction.atomic():
+                    if not RSVP.objects.filter(user=user, event_id=event_id).exists():
+                        RSVP.objects.create(user=user, event_id=event_id, is_confirmed=True, confirmed_at=timezone.now())
+            except OperationalError as exc:
+                with lock:
+                    errors.append(str(exc))
+                continue
+            with lock:
+                latencies.append((time.perf_counter() - started) * 1000)
+        connection.close()
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(WORKERS)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    p95 = latencies[int(len(latencies) * 0.95)] if latencies else 0
+    print(
+        f"{os.environ['BENCH_MODE']:<8} {len(latencies):>6} {len(errors):>7} {len(latencies) / elapsed:>9.0f} "
+        f"{statistics.median(latencies) if latencies else 0:>9.2f} {p95:>9.2f}"
+    )
+    for message in sorted(set(errors)):
+        print(f"         {errors.count(message)} x {message}")
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1 and sys.argv[1] == '--child':
+        run_mode()
+        sys.exit()
+
+    print(f"{WORKERS} threads x {RSVPS_PER_WORKER} RSVPs")
+    print(f"{'mode':<8} {'ok':>6} {'errors':>7} {'rsvps/s':>9} {'p50 ms':>9} {'p95 ms':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for mode, tuned in MODES:
+            env = dict(
+                os.environ, BENCH_MODE=mode, SQLITE_TUNED=tuned,
+                DATABASE_URL=f"sqlite:///{os.path.join(tmp, f'{mode}.db')}",
+            )
+            subprocess.run([sys.executable, os.path.abspath(__file__), '--child'], env=env, cwd=ROOT, check=True)
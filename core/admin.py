@@ -1,3 +1,28 @@
 from django.contrib import admin
+from django.core.paginator import Paginator
+from django.utils.functional import cached_property
 
-# Register your models here.
+
+# pages beyond this are still reachable through filters and search
+COUNT_CAP = 10000
+
+
+class CappedPaginator(Paginator):
+    """Counts at most COUNT_CAP rows (COUNT over a LIMITed subquery) instead of the whole table."""
+
+    @cached_property
+    def count(self):
+        return self.object_list[:COUNT_CAP].count()
+
+
+class LargeTableAdmin(admin.ModelAdmin):
+    """Base for the admins of tables that grow without bound: no full COUNT(*) on any change list."""
+    paginator = CappedPaginator
+    show_full_result_count = False
+    list_per_page = 50
+
+    def get_actions(self, request):
+        # delete_selected runs the cascade collector over every selected row
+        actions = super().get_actions(request)
+        actions.pop('delete_selected', None)
+        return actions
@@ -0,0 +1,176 @@
+import math
+import random
+import threading
+import time
+from collections import OrderedDict
+from django.core.cache import caches
+
+
+class TieredCache:
+    """
+    A small in-process LRU (with a short TTL) in front of a shared Django cache.
+
+    Reads try this process first, then the shared backend, then compute.
+    Entries carry their compute time, so get_or_set() refreshes a hot key
+    a little before it expires (probabilistic early expiration), and a hard
+    miss is computed by one worker at a time behind a lock in the shared
+    cache while the others wait for its result.
+
+    Namespaces are versioned: bump() moves every key of a namespace to a new
+    version at once. Other processes see the change within `local_ttl`.
+    """
+
+    def __init__(self, alias='default', max_entries=1000, local_ttl=5, beta=1.0, lock_timeout=10):
+        self.alias = alias
+        self.max_entries = max_entries
+        self.local_ttl = local_ttl
+        self.beta = beta
+        self.lock_timeout = lock_timeout
+        self._local = OrderedDict()
+        self._lock = threading.Lock()
+        self.counters = dict.fromkeys(
+            ['local_hits', 'shared_hits', 'misses', 'early_refreshes', 'lock_waits', 'evictions'], 0
+        )
+
+    @property
+    def shared(self):
+        return caches[self.alias]
+
+    def stats(self):
+        with self._lock:
+            return dict(self.counters, local_entries=len(self._local))
+
+    def _count(self, name):
+        with self._lock:
+            self.counters[name] += 1
+
+    # local tier
+
+    def _local_get(self, key):
+        with self._lock:
+            item = self._local.get(key)
+            if item is None:
+                return None
+            if item[0] <= time.monotonic():
+                del self._local[key]
+                return None
+            self._local.move_to_end(key)
+            return item[1]
+
+    def _local_set(self, key, entry):
+        expires = time.monotonic() + self.local_ttl
+        if entry[2] is not None:
+            expires = min(expires, time.monotonic() + max(0, entry[2] - time.time()))
+        with self._lock:
+            self._local[key] = (expires, entry)
+            self._local.move_to_end(key)
+            while len(self._local) > self.max_entries:
+                self._local.popitem(last=False)
+                self.counters['evictions'] += 1
+
+    def _local_delete(self, prefix):
+        with self._lock:
+            for key in [key for key in self._local if key.startswith(prefix)]:
+                del self._local[key]
+
+    # versioned keys
+
+    def version(self, namespace):
+        key = f"{namespace}:version"
+        entry = self._local_get(key)
+        if entry is None:
+            entry = (self.shared.get_or_set(key, 1, None), 0, None)
+            self._local_set(key, entry)
+        return entry[0]
+
+    def bump(self, namespace):
+        """Orphan every key of `namespace`, in every process. Returns the new version."""
+        key = f"{namespace}:version"
+        try:
+            version = self.shared.incr(key)
+        except ValueError:
+            version = 2
+            self.shared.set(key, version, None)
+        self._local_delete(f"{namespace}:")
+        return version
+
+    def make_key(self, key, namespace=None):
+        if namespace is None:
+            return key
+        return f"{namespace}:{self.version(namespace)}:{key}"
+
+    # reads and writes
+
+    def _get_entry(self, key):
+        entry = self._local_get(key)
+        if entry is not None:
+            self._count('local_hits')
+            return entry
+        entry = self.shared.get(key)
+        if entry is not None:
+            self._count('shared_hits')
+            self._local_set(key, entry)
+            return entry
+        self._count('misses')
+        return None
+
+    def _set_entry(self, key, value, timeout, delta=0.0):
+        expires_at = None if timeout is None else time.time() + timeout
+        entry = (value, delta, expires_at)
+        self.shared.set(key, entry, timeout)
+        self._local_set(key, entry)
+
+    def get(self, key, default=None, namespace=None):
+        entry = self._get_entry(self.make_key(key, namespace))
+        return default if entry is None else entry[0]
+
+    def set(self, key, value, timeout=300, namespace=None):
+        self._set_entry(self.make_key(key, namespace), value, timeout)
+
+    def delete(self, key, namespace=None):
+        key = self.make_key(key, namespace)
+        self.shared.delete(key)
+        with self._lock:
+            self._local.pop(key, None)
+
+    def _expires_early(self, entry):
+        # XFetch: recompute before expiry with a probability that grows as expiry nears
+        value, delta, expires_at = entry
+        if expires_at is None or not delta:
+            return False
+        return time.time() - delta * self.beta * math.log(1 - random.random()) >= expires_at
+
+    def get_or_set(self, key, compute, timeout=300, namespace=None):
+        key = self.make_key(key, namespace)
+        entry = self._get_entry(key)
+        if entry is not None:
+            if not self._expires_early(entry):
+                return entry[0]
+            self._count('early_refreshes')
+            return self._compute(key, compute, timeout)
+
+        lock_key = f"{key}:lock"
+        if not self.shared.add(lock_key, 1, self.lock_timeout):
+            # someone else is computing it, wait for their result rather than piling on
+            self._count('lock_waits')
+            deadline = time.monotonic() + self.lock_timeout
+            while time.monotonic() < deadline:
+                time.sleep(0.05)
+                entry = self.shared.get(key)
+                if entry is not None:
+                    self._local_set(key, entry)
+                    return entry[0]
+            return self._compute(key, compute, timeout)
+        try:
+            return self._compute(key, compute, timeout)
+        finally:
+            self.shared.delete(lock_key)
+
+    def _compute(self, key, compute, timeout):
+        started = time.monotonic()
+        value = compute()
+        self._set_entry(key, value, timeout, time.monotonic() - started)
+        return value
+
+
+tiered_cache = TieredCache()
@@ -0,0 +1,72 @@
+import time
+from datetime import timedelta
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from events.models import ArchivedRSVP, Event, RSVP
+from users.models import UserDeletion
+
+
+class Command(BaseCommand):
+    help = (
+        "Hard-delete soft-deleted events and users. RSVPs are removed first in small "
+        "chunks with raw DELETEs (one short transaction each), so the final row deletes "
+        "have nothing left to cascade over."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=1000, help="Rows deleted per transaction.")
+        parser.add_argument('--batch-size', type=int, default=50, help="Events/users handled per batch.")
+        parser.add_argument('--grace-minutes', type=int, default=0, help="Only purge rows deleted at least this long ago.")
+        parser.add_argument('--pause', type=float, default=0, help="Seconds to sleep between chunks.")
+
+    def handle(self, *args, **options):
+        self.chunk_size = options['chunk_size']
+        self.pause = options['pause']
+        batch_size = options['batch_size']
+        cutoff = timezone.now() - timedelta(minutes=options['grace_minutes'])
+        started = time.monotonic()
+
+        deleted = Event.all_objects.filter(deleted_at__isnull=False, deleted_at__lte=cutoff)
+        # occurrences before their series, so deleting a series never cascades
+        event_ids = list(deleted.filter(parent__isnull=False).values_list('id', flat=True))
+        event_ids += list(deleted.filter(parent__isnull=True).values_list('id', flat=True))
+        rsvps = 0
+        for i in range(0, len(event_ids), batch_size):
+            batch = event_ids[i:i + batch_size]
+            rsvps += self.delete_in_chunks(RSVP.all_objects.filter(event_id__in=batch))
+            with transaction.atomic():
+                Event.all_objects.filter(id__in=batch).delete()
+
+        user_ids = list(
+            UserDeletion.objects.filter(requested_at__lte=cutoff).values_list('user_id', flat=True)
+        )
+        users = 0
+        for i in range(0, len(user_ids), batch_size):
+            batch = user_ids[i:i + batch_size]
+            rsvps += self.delete_in_chunks(RSVP.all_objects.filter(user_id__in=batch))
+            rsvps += self.delete_in_chunks(ArchivedRSVP.objects.filter(user_id__in=batch))
+            self.delete_in_chunks(User.groups.through.objects.filter(user_id__in=batch))
+            with transaction.atomic():
+                Event.all_objects.filter(organizer_id__in=batch).update(organizer=None)
+                users += User.objects.filter(id__in=batch, is_superuser=False).delete()[1].get('auth.User', 0)
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Purged {len(event_ids)} events, {users} users and {rsvps} RSVPs in {elapsed:.1f}s."
+        ))
+
+    def delete_in_chunks(self, queryset):
+        total = 0
+        model = queryset.model
+        while True:
+            pks = list(queryset.values_list('pk', flat=True)[:self.chunk_size])
+            if not pks:
+                return total
+            with transaction.atomic():
+                # _raw_delete issues a plain DELETE ... WHERE pk IN (...) without
+                # the collector; safe here because nothing references these rows
+                total += model._base_manager.filter(pk__in=pks)._raw_delete(queryset.db)
+            if self.pause:
+                time.sleep(self.pause)
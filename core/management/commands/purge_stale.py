@@ -0,0 +1,84 @@
+import time
+from datetime import timedelta
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Exists, Min, OuterRef
+from django.utils import timezone
+from events.models import ArchivedEvent, Event, RSVP
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete RSVPs that were never confirmed and accounts that were never activated once "
+        "they are older than their window, in small batches with one short transaction each. "
+        "Both scans are served by partial indexes (rsvp_unconfirmed_idx, user_pending_activation_idx)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rsvp-days', type=int, default=7, help="Days an RSVP may stay unconfirmed.")
+        parser.add_argument('--user-days', type=int, default=30, help="Days an account may stay unactivated.")
+        parser.add_argument('--chunk-size', type=int, default=1000, help="Rows deleted per transaction.")
+        parser.add_argument('--pause', type=float, default=0, help="Seconds to sleep between chunks.")
+        parser.add_argument('--dry-run', action='store_true', help="Only report what would be deleted.")
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        self.chunk_size = options['chunk_size']
+        self.pause = options['pause']
+        targets = [
+            ('unconfirmed RSVPs', 'rsvp_date', self.stale_rsvps(now - timedelta(days=options['rsvp_days'])),
+             self.delete_rsvps),
+            ('unactivated users', 'date_joined', self.stale_users(now - timedelta(days=options['user_days'])),
+             self.delete_users),
+        ]
+        for label, date_field, queryset, delete in targets:
+            if options['dry_run']:
+                stats = queryset.aggregate(oldest=Min(date_field))
+                total = queryset.count()
+                oldest = f", oldest from {stats['oldest']:%d %b %Y}" if total else ""
+                self.stdout.write(f"[dry run] {total} {label} would be deleted{oldest}.")
+                continue
+            started = time.monotonic()
+            total = self.delete_in_chunks(queryset, delete)
+            elapsed = time.monotonic() - started
+            rate = total / elapsed if elapsed else 0
+            self.stdout.write(self.style.SUCCESS(
+                f"Deleted {total} {label} in {elapsed:.1f}s ({rate:.0f} rows/s)."
+            ))
+
+    def stale_rsvps(self, cutoff):
+        return RSVP.all_objects.filter(is_confirmed=False, rsvp_date__lt=cutoff)
+
+    def stale_users(self, cutoff):
+        # organizers keep their account even if it was never activated
+        return User.objects.filter(
+            is_active=False, last_login__isnull=True, date_joined__lt=cutoff, is_staff=False, is_superuser=False
+        ).exclude(
+            Exists(Event.all_objects.filter(organizer=OuterRef('pk')))
+        ).exclude(
+            Exists(ArchivedEvent.objects.filter(organizer=OuterRef('pk')))
+        )
+
+    def delete_rsvps(self, queryset, pks):
+        # _raw_delete skips the collector and the activity log: nothing references
+        # an RSVP, and an expired confirmation is not a cancellation
+        return RSVP.all_objects.filter(pk__in=pks)._raw_delete(queryset.db)
+
+    def delete_users(self, queryset, pks):
+        # the collector takes their group memberships and pending deletions along
+        return User.objects.filter(pk__in=pks).delete()[1].get('auth.User', 0)
+
+    def delete_in_chunks(self, queryset, delete):
+        total = 0
+        while True:
+            pks = list(queryset.order_by().values_list('pk', flat=True)[:self.chunk_size])
+            if not pks:
+                return total
+            with transaction.atomic():
+                # re-check the filter inside the transaction: a row confirmed or
+                # activated since the SELECT above is left alone
+                pks = list(queryset.filter(pk__in=pks).select_for_update().values_list('pk', flat=True))
+                total += delete(queryset, pks)
+            if self.pause:
+                time.sleep(self.pause)
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+from core.warmup import warm_up
+
+
+class Command(BaseCommand):
+    help = (
+        "Open DB connections, compile templates and prime the category, role and "
+        "home page caches, printing how long each step took. Use --rounds 2 to "
+        "compare a cold pass with a warm one. Serving workers warm themselves up "
+        "at startup (event_management/asgi.py); this process only measures."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rounds', type=int, default=1, help="Number of warm-up passes to time.")
+
+    def handle(self, *args, **options):
+        for round_number in range(1, options['rounds'] + 1):
+            timings = warm_up()
+            label = 'cold' if round_number == 1 else 'warm'
+            self.stdout.write(f"Round {round_number} ({label}):")
+            for name, ms in timings:
+                self.stdout.write(f"  {name:<22} {ms:8.1f} ms")
+            self.stdout.write(self.style.SUCCESS(f"  {'total':<22} {sum(ms for _, ms in timings):8.1f} ms"))
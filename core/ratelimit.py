@@ -0,0 +1,109 @@
+import math
+import time
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+
+
+PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+
+def parse_rate(rate):
+    """'10/m' -> (10, 60)"""
+    count, period = rate.split('/')
+    return int(count), PERIODS[period[0]]
+
+
+def _incr(key, timeout):
+    cache.add(key, 0, timeout)
+    try:
+        return cache.incr(key)
+    except ValueError:
+        # expired between add() and incr()
+        cache.set(key, 1, timeout)
+        return 1
+
+
+def hit(key, limit, period):
+    """
+    Sliding window counter: requests in the current fixed window plus those
+    of the previous one, weighted by how much of it still falls within the
+    last `period` seconds. A burst straddling a window boundary can't get
+    twice the rate through, as with a plain fixed window.
+    One cache incr per request, atomic on Redis and Memcached (the file
+    cache of development has no atomic incr), no locks and no waiting.
+    Returns (allowed, seconds until the current window ends).
+    """
+    now = time.time()
+    window = int(now // period)
+    count = _incr(f"rl:{key}:{window}", 2 * period)
+    previous = cache.get(f"rl:{key}:{window - 1}", 0)
+    elapsed = now - window * period
+    allowed = previous * (1 - elapsed / period) + count <= limit
+    return allowed, 0 if allowed else math.ceil(period - elapsed)
+
+
+def client_ip(request):
+    """
+    REMOTE_ADDR, or with settings.RATELIMIT_TRUSTED_PROXIES = n, the address
+    the outermost of those proxies saw: the n-th X-Forwarded-For entry from
+    the right. Entries further left are whatever the client sent.
+    """
+    proxies = getattr(settings, 'RATELIMIT_TRUSTED_PROXIES', 0)
+    if proxies:
+        forwarded = [part.strip() for part in request.META.get('HTTP_X_FORWARDED_FOR', '').split(',')]
+        forwarded = [part for part in forwarded if part]
+        # fewer entries than proxies: the request did not come through all of them
+        if len(forwarded) >= proxies:
+            return forwarded[-proxies]
+    return request.META.get('REMOTE_ADDR', '')
+
+
+def check_rate(request, scope, rate):
+    """Count the request against the per-IP and, if logged in, the per-user limit; seconds to wait or 0."""
+    capacity, period = parse_rate(rate)
+    keys = [f"{scope}:ip:{client_ip(request)}"]
+    if request.user.is_authenticated:
+        keys.append(f"{scope}:user:{request.user.pk}")
+    retry_after = 0
+    for key in keys:
+        allowed, wait = hit(key, capacity, period)
+        if not allowed:
+            retry_after = max(retry_after, wait)
+    return retry_after
+
+
+def too_many_requests(retry_after):
+    response = HttpResponse("Too many requests. Please slow down and try again shortly.", status=429)
+    response['Retry-After'] = str(retry_after)
+    return response
+
+
+class RateLimitMiddleware:
+    """
+    Applies settings.RATELIMITS, keyed by URL name, e.g.
+    {'sign-in': {'rate': '5/m', 'methods': ['POST']}}.
+    Runs in process_view, so a throttled request never reaches the view
+    (no queries, no password hashing, no email).
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.rules = getattr(settings, 'RATELIMITS', {})
+
+    def __call__(self, request):
+        return self.get_response(request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        match = request.resolver_match
+        rule = self.rules.get(match.url_name) if match else None
+        if not rule:
+            return None
+        methods = rule.get('methods')
+        if methods and request.method not in methods:
+            return None
+        retry_after = check_rate(request, match.url_name, rule['rate'])
+        if retry_after:
+            return too_many_requests(retry_after)
+        return None
+
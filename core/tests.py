@@ -1,3 +1,95 @@
-from django.test import TestCase
+import threading
+import time
+from unittest import mock
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import caches
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from core.cache import TieredCache
+from core.ratelimit import check_rate, client_ip, hit
 
-# Create your tests here.
+
+@override_settings(CACHES={
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'tiered-cache-tests'},
+})
+class TieredCacheTests(SimpleTestCase):
+    def setUp(self):
+        caches['default'].clear()
+
+    def test_second_worker_reads_shared_tier(self):
+        first, second = TieredCache(), TieredCache()
+        first.set('key', 'value')
+        self.assertEqual(first.get('key'), 'value')
+        self.assertEqual(second.get('key'), 'value')
+        self.assertEqual(first.stats()['local_hits'], 1)
+        self.assertEqual(second.stats()['shared_hits'], 1)
+
+    def test_lru_evicts_oldest_entry(self):
+        tiered = TieredCache(max_entries=2)
+        for key in ('a', 'b', 'c'):
+            tiered.set(key, key)
+        self.assertEqual(tiered.stats()['evictions'], 1)
+        self.assertEqual(tiered.stats()['local_entries'], 2)
+
+    def test_bump_orphans_namespace_in_every_worker(self):
+        first, second = TieredCache(local_ttl=0), TieredCache(local_ttl=0)
+        first.set('rows', [1], namespace='facets')
+        self.assertEqual(second.get('rows', namespace='facets'), [1])
+        first.bump('facets')
+        self.assertIsNone(second.get('rows', namespace='facets'))
+
+    def test_hard_miss_is_computed_once(self):
+        calls = []
+
+        def compute():
+            calls.append(1)
+            time.sleep(0.2)
+            return 'rows'
+
+        workers = [TieredCache() for _ in range(8)]
+        results = []
+        threads = [
+            threading.Thread(target=lambda w=worker: results.append(w.get_or_set('home', compute)))
+            for worker in workers
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, ['rows'] * 8)
+
+    def test_slow_key_is_refreshed_before_it_expires(self):
+        tiered = TieredCache(beta=1e9)
+        tiered.get_or_set('slow', lambda: time.sleep(0.01) or 'old', timeout=60)
+        self.assertEqual(tiered.get_or_set('slow', lambda: 'new', timeout=60), 'new')
+        self.assertEqual(tiered.stats()['early_refreshes'], 1)
+
+
+@override_settings(CACHES={
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'ratelimit-tests'},
+})
+class RateLimitTests(SimpleTestCase):
+    def setUp(self):
+        caches['default'].clear()
+
+    def test_previous_window_still_counts_after_the_boundary(self):
+        with mock.patch('core.ratelimit.time.time', return_value=1200.0) as clock:
+            self.assertEqual([hit('k', 5, 60)[0] for _ in range(6)], [True] * 5 + [False])
+            self.assertEqual(hit('k', 5, 60), (False, 60))
+            # half way into the next window half of the previous 7 hits still count
+            clock.return_value = 1290.0
+            self.assertEqual([hit('k', 5, 60)[0] for _ in range(3)], [True, False, False])
+
+    def request(self, forwarded):
+        request = RequestFactory().post('/', REMOTE_ADDR='10.0.0.1', HTTP_X_FORWARDED_FOR=forwarded)
+        request.user = AnonymousUser()
+        return request
+
+    def test_forwarded_for_is_ignored_unless_proxies_are_configured(self):
+        self.assertEqual(client_ip(self.request('198.51.100.1, 203.0.113.7')), '10.0.0.1')
+
+    @override_settings(RATELIMIT_TRUSTED_PROXIES=1)
+    def test_spoofed_forwarded_for_does_not_reset_the_limit(self):
+        # a bot sends a new address each time, the proxy appends the one it really saw
+        retry_after = [check_rate(self.request(f'198.51.100.{i}, 203.0.113.7'), 'sign-in', '5/m') for i in range(6)]
+        self.assertEqual([bool(wait) for wait in retry_after], [False] * 5 + [True])
@@ -0,0 +1,90 @@
+import time
+from pathlib import Path
+from django.apps import apps
+from django.contrib.auth.models import AnonymousUser
+from django.db import connections
+from django.template import engines
+from django.test import RequestFactory
+from django.urls import reverse
+
+
+# apps whose templates get compiled up front
+WARMUP_APPS = ['events', 'users', 'core']
+ROLE_NAMES = ['Admin', 'Organizer', 'User']
+
+
+def open_connections():
+    for alias in connections:
+        connections[alias].ensure_connection()
+
+
+def populate_urls():
+    # the first reverse() builds the whole resolver
+    reverse('home')
+
+
+def template_names():
+    engine = engines['django'].engine
+    roots = [Path(path) for path in engine.dirs]
+    roots += [Path(apps.get_app_config(label).path) / 'templates' for label in WARMUP_APPS]
+    for root in roots:
+        for path in sorted(root.rglob('*.html')):
+            yield path.relative_to(root).as_posix()
+
+
+def compile_templates():
+    engine = engines['django']
+    for name in template_names():
+        engine.get_template(name)
+
+
+def prime_category_choices():
+    from events.categories import category_choices
+    category_choices()
+
+
+def build_typeahead_index():
+    from events.typeahead import typeahead
+    typeahead.build()
+
+
+def prime_group_ids():
+    # a missing group is still created by group_id() the first time a request needs it
+    from users.roles import load_group_ids
+    load_group_ids(ROLE_NAMES)
+
+
+def prime_home_page():
+    """Render the anonymous first page once, which fills the facet cache and the home queries' code paths."""
+    from events.views import home
+    request = RequestFactory().get(reverse('home'))
+    request.user = AnonymousUser()
+    home(request)
+
+
+STEPS = [
+    ('database connections', open_connections),
+    ('url resolver', populate_urls),
+    ('templates', compile_templates),
+    ('category choices', prime_category_choices),
+    ('typeahead index', build_typeahead_index),
+    ('role group ids', prime_group_ids),
+    ('home page', prime_home_page),
+]
+
+
+def warm_up():
+    """
+    Run every warm-up step and return [(step, milliseconds)].
+    Each uvicorn worker runs it at startup, from the ASGI lifespan handler in
+    event_management/asgi.py, after the fork: connections opened before it
+    must not be shared between workers. `python manage.py warmup` only times
+    the steps in its own process; apart from the shared cache entries it
+    warms nothing a server uses.
+    """
+    timings = []
+    for name, step in STEPS:
+        started = time.perf_counter()
+        step()
+        timings.append((name, (time.perf_counter() - started) * 1000))
+    return timings
@@ -0,0 +1,61 @@
+from contextlib import contextmanager
+from asgiref.local import Local
+from django.db import transaction
+
+
+# asgiref's Local follows a request from the async handler into the threads running its sync code
+_state = Local()
+
+
+def queue(rows, **options):
+    """
+    Save `rows` (instances of one model) with bulk_create(**options) once the
+    current transaction commits; rows of a rolled back transaction are dropped.
+    Inside buffered() they wait for its end and are saved together, one
+    bulk_create per model, otherwise they are saved at the commit.
+    """
+    rows = list(rows)
+    if rows:
+        # outside a transaction on_commit runs the callback right away
+        transaction.on_commit(lambda: _hold(rows, options))
+
+
+def _hold(rows, options):
+    pending = getattr(_state, 'pending', None)
+    if pending is None:
+        _save(type(rows[0]), rows, options)
+    else:
+        pending.setdefault((type(rows[0]), tuple(sorted(options.items()))), []).extend(rows)
+
+
+def _save(model, rows, options):
+    if rows[0].pk is not None:
+        # rows that bring their own key (dirty pages) are queued once per key
+        rows = list({row.pk: row for row in rows}.values())
+    model.objects.bulk_create(rows, **dict(options))
+
+
+@contextmanager
+def buffered():
+    """Hold the rows queued inside the block and write them when it ends. Nests."""
+    if getattr(_state, 'pending', None) is not None:
+        yield
+        return
+    _state.pending = {}
+    try:
+        yield
+    finally:
+        pending, _state.pending = _state.pending, None
+        for (model, options), rows in pending.items():
+            _save(model, rows, options)
+
+
+class WriteBufferMiddleware:
+    """Writes the rows a request queued (activity log, dirty pages) after the view, in one go."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with buffered():
+            return self.get_response(request)
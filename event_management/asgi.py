@@ -7,10 +7,34 @@ For more information on this file, see
 https://docs.djangoproject.com/en/6.0/howto/deployment/asgi/
 """
 
+import logging
 import os
 
+from asgiref.sync import sync_to_async
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'event_management.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+from core.warmup import warm_up  # noqa: E402 (needs the apps loaded above)
+
+logger = logging.getLogger(__name__)
+
+
+async def application(scope, receive, send):
+    if scope['type'] != 'lifespan':
+        return await django_application(scope, receive, send)
+    # uvicorn runs the lifespan once in every worker process, after the fork and before it takes requests
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            try:
+                await sync_to_async(warm_up)()
+            except Exception:
+                # a cold worker is slower, not broken: serve anyway
+                logger.exception("Warm-up failed")
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
@@ -1,4 +1,5 @@
 from pathlib import Path
+import tempfile
 import dj_database_url 
 from decouple import config
 
@@ -12,8 +13,12 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 # SECURITY WARNING: keep the secret key used in production secret!
 SECRET_KEY = config('SECRET_KEY')
 
+# 'development' (default) or 'production', picked per environment
+DJANGO_ENV = config('DJANGO_ENV', default='development')
+PRODUCTION = DJANGO_ENV == 'production'
+
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = True
+DEBUG = config('DEBUG', default=not PRODUCTION, cast=bool)
 
 ALLOWED_HOSTS = ['*']
 CSRF_TRUSTED_ORIGINS = ['https://*.onrender.com', 'http://127.0.0.1:8000/']
@@ -30,7 +35,6 @@ INSTALLED_APPS = [
     'django.contrib.staticfiles',
     'events',
     'event_management',
-    'debug_toolbar',
     'users',
     'core',
 ]
@@ -43,10 +47,16 @@ MIDDLEWARE = [
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
+    'core.ratelimit.RateLimitMiddleware',
+    'core.writebuffer.WriteBufferMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
-    "debug_toolbar.middleware.DebugToolbarMiddleware",
 ]
 
+# the toolbar instruments every response, development only
+if DEBUG:
+    INSTALLED_APPS.append('debug_toolbar')
+    MIDDLEWARE.append("debug_toolbar.middleware.DebugToolbarMiddleware")
+
 ROOT_URLCONF = 'event_management.urls'
 
 TEMPLATES = [
@@ -64,7 +74,19 @@ TEMPLATES = [
     },
 ]
 
+if PRODUCTION:
+    # compiled templates are kept for the life of the process
+    TEMPLATES[0]['APP_DIRS'] = False
+    TEMPLATES[0]['OPTIONS']['loaders'] = [
+        ('django.template.loaders.cached.Loader', [
+            'django.template.loaders.filesystem.Loader',
+            'django.template.loaders.app_directories.Loader',
+        ]),
+    ]
+
 WSGI_APPLICATION = 'event_management.wsgi.application'
+# served by uvicorn (see Procfile); the live participant counts need ASGI
+ASGI_APPLICATION = 'event_management.asgi.application'
 
 
 # Database
@@ -85,6 +107,25 @@ DATABASES = {
     )
 }
 
+# Opt-in tuning for single-node installs on SQLite (SQLITE_TUNED=True):
+# WAL lets readers run next to the one writer, write transactions take the
+# write lock up front (BEGIN IMMEDIATE) instead of failing with "database is
+# locked" when a read tries to upgrade, and busy_timeout makes them queue.
+SQLITE_TUNED = config('SQLITE_TUNED', default=False, cast=bool)
+SQLITE_PRAGMAS = [
+    'PRAGMA journal_mode=WAL',
+    'PRAGMA synchronous=NORMAL',     # fsync at checkpoints only; safe with WAL
+    'PRAGMA mmap_size=268435456',    # 256 MiB
+    'PRAGMA cache_size=-65536',      # 64 MiB per connection
+    'PRAGMA busy_timeout=10000',     # ms
+    'PRAGMA temp_store=MEMORY',
+]
+if SQLITE_TUNED and DATABASES['default']['ENGINE'] == 'django.db.backends.sqlite3':
+    DATABASES['default'].setdefault('OPTIONS', {}).update({
+        'init_command': ';'.join(SQLITE_PRAGMAS),
+        'transaction_mode': 'IMMEDIATE',
+    })
+
 # For Postgres
 # DATABASES = {
 #     'default': {
@@ -98,6 +139,29 @@ DATABASES = {
 # }
 
 
+# Cache
+# Shared between workers: Redis when REDIS_URL is set, a file-based cache otherwise.
+# core/cache.py keeps a small per-process LRU in front of it.
+REDIS_URL = config('REDIS_URL', default='')
+
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+            'TIMEOUT': 300,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': config('CACHE_DIR', default=str(Path(tempfile.gettempdir()) / 'event_management_cache')),
+            'TIMEOUT': 300,
+            'OPTIONS': {'MAX_ENTRIES': 10000},
+        }
+    }
+
 
 INTERNAL_IPS = [
     # ...
@@ -149,6 +213,19 @@ STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR/'media'
 
+# Pre-rendered anonymous pages written by `python manage.py export_pages`; the
+# web server / CDN in front of Django serves them for requests without a session
+STATIC_PAGES_ROOT = config('STATIC_PAGES_ROOT', default=str(BASE_DIR / 'static_pages'))
+
+# Multipart uploads above this size are spooled to FILE_UPLOAD_TEMP_DIR instead of memory
+FILE_UPLOAD_MAX_MEMORY_SIZE = config('FILE_UPLOAD_MAX_MEMORY_SIZE', default=2621440, cast=int)
+FILE_UPLOAD_TEMP_DIR = config('FILE_UPLOAD_TEMP_DIR', default=None)
+
+# Resumable banner uploads (events/uploads.py)
+CHUNKED_UPLOAD_CHUNK_SIZE = config('CHUNKED_UPLOAD_CHUNK_SIZE', default=4 * 1024 * 1024, cast=int)
+CHUNKED_UPLOAD_MAX_SIZE = config('CHUNKED_UPLOAD_MAX_SIZE', default=20 * 1024 * 1024, cast=int)
+CHUNKED_UPLOAD_EXPIRY = 60 * 60 * 24
+
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
@@ -161,6 +238,19 @@ EMAIL_HOST_PASSWORD = config('EMAIL_HOST_PASSWORD')
 
 
 
+# Per URL name sliding-window limits, checked per IP and per logged-in user (core/ratelimit.py)
+RATELIMITS = {
+    'quick-rsvp': {'rate': '10/m'},
+    'details': {'rate': '10/m', 'methods': ['POST']},
+    'sign-in': {'rate': '5/m', 'methods': ['POST']},
+    'sign-up': {'rate': '5/m', 'methods': ['POST']},
+}
+# Number of proxies in front of the app that append the client address to X-Forwarded-For
+# (1 behind Render's load balancer). Behind a proxy REMOTE_ADDR is the proxy for every visitor,
+# so at 0 all clients share one bucket and 5 sign-ins a minute lock out the whole site; set it
+# higher than the real number of proxies and clients can pick their own address.
+RATELIMIT_TRUSTED_PROXIES = config('RATELIMIT_TRUSTED_PROXIES', default=0, cast=int)
+
 FRONTEND_URL = 'http://127.0.0.1:8000/'
 LOGIN_URL = 'sign-in'
 LOGIN_REDIRECT_URL = 'home'                           
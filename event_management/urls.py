@@ -1,22 +1,40 @@
-from debug_toolbar.toolbar import debug_toolbar_urls
 from django.contrib import admin
 from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
-from events.views import home, details, dashboard, create_event, quick_rsvp, confirm_rsvp
+from events.views import (
+    home, details, dashboard, create_event, quick_rsvp, confirm_rsvp, event_live_count, check_in, check_in_sync,
+    upload_start, upload_chunk, upload_complete
+)
+from events.api import event_list, event_detail, event_attendees, rsvp_activity, suggest
 from core.views import no_permission
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('', home, name='home'),
     path('event/<int:id>/', details, name='details'),
+    path('event/<int:id>/live/', event_live_count, name='event-live-count'),
+    path('event/<int:id>/check-in/', check_in, name='check-in'),
+    path('event/<int:id>/check-in/sync/', check_in_sync, name='check-in-sync'),
+    path('uploads/', upload_start, name='upload-start'),
+    path('uploads/<str:upload_id>/', upload_chunk, name='upload-chunk'),
+    path('uploads/<str:upload_id>/complete/', upload_complete, name='upload-complete'),
     path('dashboard/', dashboard, name='dashboard'),
     path('create-event/', create_event, name='create_event'),
     path('rsvp/<int:event_id>/', quick_rsvp, name='quick-rsvp'),
     path('rsvp/confirm/<uuid:token>/', confirm_rsvp, name='confirm-rsvp'),
+    path('api/events/', event_list, name='api-event-list'),
+    path('api/events/<int:id>/', event_detail, name='api-event-detail'),
+    path('api/events/<int:id>/attendees/', event_attendees, name='api-event-attendees'),
+    path('api/suggest/', suggest, name='api-suggest'),
+    path('api/activity/', rsvp_activity, name='api-rsvp-activity'),
     path('no-permission/', no_permission, name='no-permission'),
     path('user/', include('users.urls')),
-]+ debug_toolbar_urls()
+]
+
+if 'debug_toolbar' in settings.INSTALLED_APPS:
+    from debug_toolbar.toolbar import debug_toolbar_urls
+    urlpatterns += debug_toolbar_urls()
 
 
 urlpatterns += static(settings.MEDIA_URL, document_root = settings.MEDIA_ROOT)
\ No newline at end of file
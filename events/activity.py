@@ -0,0 +1,40 @@
+from django.db.models import Q
+from core import writebuffer
+from events.models import ArchivedEvent, Event, RSVPActivity
+
+
+ACTIVITY_PAGE_SIZE = 100
+
+
+def record(action, event_id, user_id=None, rsvp_id=None):
+    """
+    Queue one log entry. It is written when the transaction commits, never if
+    it rolls back; the entries of a request are written together with one
+    bulk_create after the view (core.writebuffer).
+    """
+    writebuffer.queue([RSVPActivity(action=action, event_id=event_id, user_id=user_id, rsvp_id=rsvp_id)], batch_size=1000)
+
+
+def organizer_activity(user, event_id=None, actions=None, since=None, until=None, before=None):
+    """
+    Newest-first log entries for the events `user` organizes, archived ones
+    included (all events for admins, pass user=None). `before` is the last id
+    of the previous page. Served by the (event_id, at) index.
+    """
+    entries = RSVPActivity.objects.all()
+    if user is not None:
+        entries = entries.filter(
+            Q(event_id__in=Event.all_objects.filter(organizer=user).values('id'))
+            | Q(event_id__in=ArchivedEvent.objects.filter(organizer=user).values('id'))
+        )
+    if event_id is not None:
+        entries = entries.filter(event_id=event_id)
+    if actions:
+        entries = entries.filter(action__in=actions)
+    if since is not None:
+        entries = entries.filter(at__gte=since)
+    if until is not None:
+        entries = entries.filter(at__lt=until)
+    if before is not None:
+        entries = entries.filter(id__lt=before)
+    return entries.order_by('-id')
@@ -0,0 +1,203 @@
+import hashlib
+from datetime import datetime
+from django.conf import settings
+from django.http import HttpResponse, JsonResponse
+from django.shortcuts import get_object_or_404
+from django.utils.cache import get_conditional_response
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from django.views.decorators.http import require_GET
+from events.activity import ACTIVITY_PAGE_SIZE, organizer_activity
+from events.models import Event, count_rsvps
+from events.typeahead import SUGGESTION_LIMIT, typeahead
+from events.views import is_admin, is_organizer
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+    import json
+    from django.core.serializers.json import DjangoJSONEncoder
+
+
+API_PAGE_SIZE = 50
+API_MAX_PAGE_SIZE = 200
+SUGGESTION_MAX_LIMIT = 20
+
+# public field name -> column lookup; only the requested ones end up in the SELECT
+EVENT_FIELDS = {
+    'id': 'id',
+    'name': 'name',
+    'description': 'description',
+    'starts_at': 'starts_at',
+    'ends_at': 'ends_at',
+    'location': 'location',
+    'image': 'image',
+    'recurrence': 'recurrence',
+    'recurrence_until': 'recurrence_until',
+    'category_id': 'category_id',
+    'category': 'category__name',
+    'participant_count': 'participant_count',
+}
+LIST_FIELDS = ['id', 'name', 'starts_at', 'ends_at', 'location', 'category', 'image']
+AGGREGATES = {'participant_count': count_rsvps(is_confirmed=True)}
+
+
+def dumps(payload):
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, cls=DjangoJSONEncoder, separators=(',', ':')).encode()
+
+
+def json_response(request, payload):
+    """Serialize once, tag the body with a strong ETag and answer 304 when the client already has it."""
+    body = dumps(payload)
+    etag = f'"{hashlib.md5(body).hexdigest()}"'
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = HttpResponse(body, content_type='application/json')
+    response['ETag'] = etag
+    response['Cache-Control'] = 'no-cache'
+    return response
+
+
+def error(message, status=400):
+    return JsonResponse({'error': message}, status=status)
+
+
+def parse_moment(value):
+    """ISO date or datetime from a query param, aware in the current time zone; None if missing or invalid."""
+    try:
+        moment = parse_datetime(value or '')
+        if moment is None and value:
+            day = parse_date(value)
+            moment = day and datetime.combine(day, datetime.min.time())
+    except ValueError:
+        # well formed but not a real date, e.g. 2026-13-45
+        return None
+    if moment is not None and timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
+
+
+def parse_fields(params, default):
+    """?fields=id,name -> ['id', 'name']; None when an unknown field is asked for."""
+    value = params.get('fields')
+    if not value:
+        return default
+    fields = [name.strip() for name in value.split(',') if name.strip()]
+    if not fields or any(name not in EVENT_FIELDS for name in fields):
+        return None
+    return fields
+
+
+def project(queryset, fields):
+    """values() over just `fields`; the GROUP BY for counts is only paid when a count is requested."""
+    rows = queryset.values('id', *(EVENT_FIELDS[name] for name in fields if name != 'id' and name not in AGGREGATES))
+    aggregates = {name: AGGREGATES[name] for name in fields if name in AGGREGATES}
+    if aggregates:
+        rows = rows.annotate(**aggregates)
+    return rows
+
+
+def to_dict(row, fields):
+    data = {name: row[EVENT_FIELDS[name]] for name in fields}
+    if data.get('image'):
+        data['image'] = settings.MEDIA_URL + data['image']
+    return data
+
+
+#EVENT LIST
+@require_GET
+def event_list(request):
+    fields = parse_fields(request.GET, LIST_FIELDS)
+    if fields is None:
+        return error(f"Unknown field. Available: {', '.join(EVENT_FIELDS)}")
+    try:
+        after = int(request.GET.get('after') or 0)
+        limit = min(int(request.GET.get('limit') or API_PAGE_SIZE), API_MAX_PAGE_SIZE)
+    except ValueError:
+        return error("'after' and 'limit' must be integers.")
+    if limit < 1:
+        return error("'limit' must be positive.")
+
+    events = Event.objects.all()
+    search_query = request.GET.get('search', '')
+    if search_query:
+        events = events.filter(name__icontains=search_query)
+    location = request.GET.get('location', '')
+    if location:
+        events = events.filter(location=location)
+    if after:
+        events = events.filter(id__gt=after)
+
+    # keyset pagination on the primary key: no OFFSET scan, stable while rows are added
+    rows = list(project(events.order_by('id'), fields)[:limit + 1])
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    payload = {
+        'results': [to_dict(row, fields) for row in rows],
+        'next': rows[-1]['id'] if has_more else None,
+    }
+    return json_response(request, payload)
+
+
+#EVENT DETAIL
+@require_GET
+def event_detail(request, id):
+    fields = parse_fields(request.GET, list(EVENT_FIELDS))
+    if fields is None:
+        return error(f"Unknown field. Available: {', '.join(EVENT_FIELDS)}")
+    row = get_object_or_404(project(Event.objects.filter(id=id), fields))
+    return json_response(request, to_dict(row, fields))
+
+
+#ATTENDEE COUNT
+@require_GET
+def event_attendees(request, id):
+    row = get_object_or_404(
+        Event.objects.filter(id=id).values('id').annotate(
+            participant_count=count_rsvps(is_confirmed=True),
+            rsvp_count=count_rsvps(),
+        )
+    )
+    return json_response(request, row)
+
+
+#TYPEAHEAD (served from the in-process index, no queries per keystroke)
+@require_GET
+def suggest(request):
+    try:
+        limit = min(int(request.GET.get('limit') or SUGGESTION_LIMIT), SUGGESTION_MAX_LIMIT)
+    except ValueError:
+        return error("'limit' must be an integer.")
+    if limit < 1:
+        return error("'limit' must be positive.")
+    return json_response(request, {'results': typeahead.suggest(request.GET.get('q', ''), limit)})
+
+
+#RSVP ACTIVITY (organizers: their events, admins: everything)
+@require_GET
+def rsvp_activity(request):
+    user = request.user
+    if is_admin(user):
+        owner = None
+    elif is_organizer(user):
+        owner = user
+    else:
+        return error("Only organizers and admins can read RSVP activity.", status=403)
+
+    try:
+        event_id = int(request.GET['event']) if request.GET.get('event') else None
+        before = int(request.GET['before']) if request.GET.get('before') else None
+        limit = min(int(request.GET.get('limit') or ACTIVITY_PAGE_SIZE), API_MAX_PAGE_SIZE)
+    except ValueError:
+        return error("'event', 'before' and 'limit' must be integers.")
+    since, until = parse_moment(request.GET.get('since')), parse_moment(request.GET.get('until'))
+    actions = [action for action in request.GET.get('action', '').split(',') if action]
+
+    entries = organizer_activity(owner, event_id=event_id, actions=actions, since=since, until=until, before=before)
+    rows = list(entries.values('id', 'action', 'at', 'event_id', 'user_id', 'rsvp_id')[:limit + 1])
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    return json_response(request, {'results': rows, 'next': rows[-1]['id'] if has_more else None})
@@ -5,4 +5,4 @@ class EventsConfig(AppConfig):
     name = 'events'
 
     def ready(self):
-        pass
\ No newline at end of file
+        import events.signals
\ No newline at end of file
@@ -0,0 +1,121 @@
+from datetime import timedelta
+from urllib.parse import urlencode
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from core.cache import tiered_cache
+from events.facets import invalidate_facets
+from events.typeahead import invalidate_typeahead
+from events.models import ArchivedEvent, ArchivedRSVP, Event, RSVP
+from events.recurrence import day_start
+
+
+DEFAULT_RETENTION_DAYS = 180
+PAST_PAGE_SIZE = 50
+ARCHIVE_COUNT_KEY = 'archive:event_count'
+ARCHIVE_COUNT_TIMEOUT = 3600
+
+
+def _copy_rows(cursor, source, target, where_column, ids):
+    """INSERT INTO target (...) SELECT ... FROM source WHERE <column> IN (ids), all inside the DB."""
+    qn = connection.ops.quote_name
+    source_columns = {field.column for field in source._meta.concrete_fields}
+    columns = ', '.join(
+        qn(field.column) for field in target._meta.concrete_fields if field.column in source_columns
+    )
+    placeholders = ', '.join(['%s'] * len(ids))
+    cursor.execute(
+        f"INSERT INTO {qn(target._meta.db_table)} ({columns}) "
+        f"SELECT {columns} FROM {qn(source._meta.db_table)} WHERE {qn(where_column)} IN ({placeholders})",
+        ids
+    )
+    return cursor.rowcount
+
+
+def archive_batch(event_ids):
+    """Move a batch of events and their RSVPs to the archive tables in one transaction."""
+    with transaction.atomic(), connection.cursor() as cursor:
+        _copy_rows(cursor, Event, ArchivedEvent, 'id', event_ids)
+        rsvps = _copy_rows(cursor, RSVP, ArchivedRSVP, 'event_id', event_ids)
+        RSVP.all_objects.filter(event_id__in=event_ids)._raw_delete(RSVP.all_objects.db)
+        # the event rows go through the ORM so anything else pointing at them cascades
+        Event.all_objects.filter(id__in=event_ids).delete()
+    return rsvps
+
+
+def archivable_events(cutoff):
+    # recurring series stay hot; their materialized occurrences are archived like any event
+    return Event.objects.filter(
+        recurrence="NONE", starts_at__lt=day_start(cutoff), occurrences__isnull=True
+    ).order_by('starts_at', 'id')
+
+
+def archive_events(days=DEFAULT_RETENTION_DAYS, batch_size=200, dry_run=False):
+    """Archive every event older than `days`, `batch_size` events per transaction."""
+    cutoff = timezone.localdate() - timedelta(days=days)
+    if dry_run:
+        events = archivable_events(cutoff)
+        return events.count(), RSVP.all_objects.filter(event__in=events).count()
+
+    events = rsvps = 0
+    while True:
+        ids = list(archivable_events(cutoff).values_list('id', flat=True)[:batch_size])
+        if not ids:
+            break
+        rsvps += archive_batch(ids)
+        events += len(ids)
+    if events:
+        invalidate_facets()
+        invalidate_typeahead()
+        tiered_cache.delete(ARCHIVE_COUNT_KEY)
+    return events, rsvps
+
+
+def archived_event_count():
+    """COUNT of the archive, cached: the table only grows when archive_events runs."""
+    return tiered_cache.get_or_set(ARCHIVE_COUNT_KEY, ArchivedEvent.objects.count, ARCHIVE_COUNT_TIMEOUT)
+
+
+def parse_past_cursor(params):
+    """(starts_at, id) from the `before_at` / `before_id` query parameters, None for the first page."""
+    try:
+        at = parse_datetime(params.get('before_at') or '')
+        return (at, int(params['before_id'])) if at else None
+    except (KeyError, ValueError):
+        return None
+
+
+def _merged_page(hot, archived, field, cursor, limit):
+    if cursor is not None:
+        at, id = cursor
+        older = Q(**{f'{field}__lt': at}) | Q(**{field: at, 'id__lt': id})
+        hot, archived = hot.filter(older), archived.filter(older)
+    order = (f'-{field}', '-id')
+    rows = list(hot.order_by(*order)[:limit + 1])
+    rows += archived.order_by(*order)[:limit + 1]
+    rows.sort(key=lambda row: (getattr(row, field), row.id), reverse=True)
+    page = rows[:limit]
+    return page, ((getattr(page[-1], field), page[-1].id) if len(rows) > limit else None)
+
+
+def past_events_page(hot, archived, cursor=None, limit=PAST_PAGE_SIZE):
+    """
+    One newest-first page over past hot events and archived ones. Both tables
+    are read with a keyset on (starts_at, id) and a LIMIT, then merged, so a
+    page costs the same however large the archive is.
+    Returns (events, cursor of the next page or None).
+    """
+    return _merged_page(hot, archived, 'starts_at', cursor, limit)
+
+
+def rsvp_history_page(hot, archived, cursor=None, limit=PAST_PAGE_SIZE):
+    """Same as past_events_page for RSVPs and archived RSVPs, keyed on (rsvp_date, id)."""
+    return _merged_page(hot, archived, 'rsvp_date', cursor, limit)
+
+
+def past_page_query(cursor, **params):
+    """Query string of the page after `cursor`."""
+    if cursor is None:
+        return None
+    return urlencode(dict(params, before_at=cursor[0].isoformat(), before_id=cursor[1]))
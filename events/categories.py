@@ -0,0 +1,84 @@
+from django.db import IntegrityError, transaction
+from django.db.models import Count
+from django.db.models.functions import Lower, Trim
+from core.cache import tiered_cache
+from events.facets import invalidate_facets
+from events.models import Category, Event
+
+
+CATEGORY_CHOICES_KEY = 'categories:choices'
+
+
+def category_choices():
+    """(id, name) pairs for category dropdowns, cached until a Category changes."""
+    return tiered_cache.get_or_set(
+        CATEGORY_CHOICES_KEY,
+        lambda: list(Category.objects.order_by(Lower('name')).values_list('id', 'name')),
+        None,
+    )
+
+
+def invalidate_category_choices():
+    tiered_cache.delete(CATEGORY_CHOICES_KEY)
+
+
+def get_or_create_category(name, description=''):
+    """Case-insensitive get-or-create, so "Music" and "music " end up as one category."""
+    name = name.strip()
+    category = Category.objects.filter(name__iexact=name).first()
+    if category:
+        return category, False
+    try:
+        with transaction.atomic():
+            return Category.objects.create(name=name, description=description or ''), True
+    except IntegrityError:
+        # lost a race against another request creating the same name
+        return Category.objects.get(name__iexact=name), False
+
+
+
+def name_key():
+    # how get_or_create_category compares names: case and surrounding spaces don't count
+    return Trim(Lower('name'))
+
+
+def duplicate_groups():
+    """Normalized names that are used by more than one category."""
+    return list(
+        Category.objects.annotate(key=name_key())
+        .values('key')
+        .annotate(total=Count('id'))
+        .filter(total__gt=1)
+        .values_list('key', flat=True)
+    )
+
+
+def merge_duplicates(dry_run=False):
+    """
+    Keep the oldest category of every duplicate group, move the events of the
+    others to it with one UPDATE per group and delete the leftovers, then
+    strip the spaces around the names that still have them.
+    Returns (groups merged, categories removed, events moved).
+    """
+    groups = removed = moved = 0
+    for key in duplicate_groups():
+        ids = list(
+            Category.objects.annotate(key=name_key()).filter(key=key).order_by('id').values_list('id', flat=True)
+        )
+        keeper, duplicates = ids[0], ids[1:]
+        groups += 1
+        removed += len(duplicates)
+        if dry_run:
+            moved += Event.all_objects.filter(category_id__in=duplicates).count()
+            continue
+        with transaction.atomic():
+            moved += Event.all_objects.filter(category_id__in=duplicates).update(category_id=keeper)
+            Category.objects.filter(id__in=duplicates).delete()
+    if dry_run:
+        return groups, removed, moved
+    renamed = Category.objects.exclude(name=Trim('name')).update(name=Trim('name'))
+    if groups or renamed:
+        # update() skips post_save, so drop the cached dropdowns here
+        invalidate_category_choices()
+        invalidate_facets()
+    return groups, removed, moved
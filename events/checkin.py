@@ -0,0 +1,169 @@
+import threading
+import time
+import uuid
+from django.db.models import Case, DateTimeField, Value, When
+from django.utils import timezone
+from events.models import Event, RSVP
+
+
+ROSTER_TTL = 300        # seconds before a roster is reloaded from the database
+SYNC_CHUNK_SIZE = 500   # tokens per UPDATE statement
+
+ADMITTED = 'admitted'
+ALREADY_CHECKED_IN = 'already_checked_in'
+INVALID = 'invalid'
+
+
+def parse_token(value):
+    try:
+        return uuid.UUID(str(value))
+    except (TypeError, ValueError):
+        return None
+
+
+def apply_checkins(scans, chunk_size=SYNC_CHUNK_SIZE):
+    """
+    Write {token: scanned_at} with one set-based statement per chunk:
+    UPDATE ... SET checked_in_at = CASE token WHEN ... END
+    WHERE token IN (...) AND checked_in_at IS NULL.
+    The first scan of a token wins. Returns the number of rows updated.
+    """
+    items = list(scans.items())
+    updated = 0
+    for i in range(0, len(items), chunk_size):
+        chunk = items[i:i + chunk_size]
+        updated += RSVP.all_objects.filter(
+            token__in=[token for token, _ in chunk], is_confirmed=True, checked_in_at__isnull=True
+        ).update(checked_in_at=Case(
+            *[When(token=token, then=Value(scanned_at)) for token, scanned_at in chunk],
+            output_field=DateTimeField(),
+        ))
+    return updated
+
+
+class Roster:
+    """Confirmed tokens of one event and the ones already through the door."""
+
+    def __init__(self, event_id):
+        self.event_id = event_id
+        self.found = False
+        self.organizer_id = None
+        self.names = {}
+        self.checked_in = set()
+        self.loaded_at = 0
+        self.lock = threading.Lock()
+
+    def load(self):
+        event = Event.objects.filter(id=self.event_id).values('organizer_id').first()
+        self.found = event is not None
+        self.organizer_id = event and event['organizer_id']
+        # one query for the whole guest list
+        rows = RSVP.objects.filter(event_id=self.event_id, is_confirmed=True).values_list(
+            'token', 'user__username', 'checked_in_at'
+        )
+        self.add(rows)
+        self.loaded_at = time.monotonic()
+
+    def add(self, rows):
+        with self.lock:
+            for token, username, checked_in_at in rows:
+                self.names[token] = username
+                if checked_in_at is not None:
+                    self.checked_in.add(token)
+
+    @property
+    def stale(self):
+        return time.monotonic() - self.loaded_at > ROSTER_TTL
+
+
+class CheckInDesk:
+    """
+    Answers door scans from per-event in-memory rosters, so unknown tokens and
+    tokens this process already let in are refused without a query. A token
+    the roster doesn't know (RSVP confirmed after loading) is looked up once
+    before it is refused.
+
+    An admission is a single UPDATE ... WHERE checked_in_at IS NULL written
+    before the answer: it survives a restart, and when two workers (whose
+    rosters can be ROSTER_TTL old) scan the same token only one UPDATE
+    matches a row.
+    """
+
+    def __init__(self):
+        self._rosters = {}
+        self._loading = {}
+        self._lock = threading.Lock()
+
+    def roster(self, event_id):
+        roster = self._rosters.get(event_id)
+        if roster is not None and not roster.stale:
+            return roster
+        with self._lock:
+            loading = self._loading.setdefault(event_id, threading.Lock())
+        # one load per event at a time; scans for other events are not held up
+        with loading:
+            roster = self._rosters.get(event_id)
+            if roster is None or roster.stale:
+                roster = Roster(event_id)
+                roster.load()
+                self._rosters[event_id] = roster
+        return roster
+
+    def _lookup(self, roster, token):
+        row = RSVP.objects.filter(event_id=roster.event_id, token=token, is_confirmed=True).values_list(
+            'token', 'user__username', 'checked_in_at'
+        ).first()
+        if row is None:
+            return False
+        roster.add([row])
+        return True
+
+    def verify(self, event_id, token, scanned_at=None):
+        """Returns (status, attendee username or None)."""
+        roster = self.roster(event_id)
+        if token not in roster.names and not self._lookup(roster, token):
+            return INVALID, None
+        name = roster.names[token]
+        if token in roster.checked_in:
+            return ALREADY_CHECKED_IN, name
+        admitted = RSVP.all_objects.filter(
+            event_id=event_id, token=token, is_confirmed=True, checked_in_at__isnull=True
+        ).update(checked_in_at=scanned_at or timezone.now())
+        if not admitted:
+            # another worker was first, or the RSVP went away since the roster was loaded
+            with roster.lock:
+                roster.names.pop(token, None)
+            if not self._lookup(roster, token):
+                return INVALID, None
+        with roster.lock:
+            roster.checked_in.add(token)
+        return (ADMITTED if admitted else ALREADY_CHECKED_IN), name
+
+    def sync(self, event_id, scans):
+        """
+        Apply offline scans {token: scanned_at} for one event.
+        Returns (applied, duplicates, invalid).
+        """
+        roster = self.roster(event_id)
+        unknown = [token for token in scans if token not in roster.names]
+        for i in range(0, len(unknown), SYNC_CHUNK_SIZE):
+            # confirmed after the roster was loaded
+            roster.add(RSVP.objects.filter(
+                event_id=event_id, token__in=unknown[i:i + SYNC_CHUNK_SIZE], is_confirmed=True
+            ).values_list('token', 'user__username', 'checked_in_at'))
+        with roster.lock:
+            valid = {token: scanned_at for token, scanned_at in scans.items() if token in roster.names}
+        applied = apply_checkins(valid)
+        with roster.lock:
+            roster.checked_in.update(valid)
+        return applied, len(valid) - applied, len(scans) - len(valid)
+
+    def forget(self, event_id=None):
+        with self._lock:
+            if event_id is None:
+                self._rosters.clear()
+            else:
+                self._rosters.pop(event_id, None)
+
+
+desk = CheckInDesk()
@@ -0,0 +1,61 @@
+import hashlib
+from django.db.models import Count
+from core.cache import tiered_cache
+from events.models import Event
+
+
+FACETS_NAMESPACE = 'facets'
+FACETS_TIMEOUT = 60 * 10
+
+
+def invalidate_facets():
+    # bumping the version orphans every cached signature at once
+    tiered_cache.bump(FACETS_NAMESPACE)
+
+
+def facet_signature(search, start, end):
+    raw = f"{search.strip().lower()}|{start or ''}|{end or ''}"
+    return hashlib.md5(raw.encode()).hexdigest()
+
+
+def facet_rows(queryset, search, start=None, end=None):
+    """
+    One grouped query over the filtered events: a row per (location, category)
+    pair with its event count. Cached per filter signature in both cache tiers.
+    """
+    return tiered_cache.get_or_set(
+        facet_signature(search, start, end),
+        lambda: list(
+            queryset.order_by()
+            .values('location', 'category_id', 'category__name')
+            .annotate(total=Count('id'))
+        ),
+        FACETS_TIMEOUT,
+        namespace=FACETS_NAMESPACE,
+    )
+
+
+def facet_counts(rows, location='', category_id=None):
+    """
+    Per-location counts honour the selected category and per-category counts
+    honour the selected location, so each dropdown shows what picking an
+    option would return.
+    """
+    location_totals = {}
+    category_totals = {}
+    category_names = {}
+    for row in rows:
+        if category_id is None or row['category_id'] == category_id:
+            location_totals[row['location']] = location_totals.get(row['location'], 0) + row['total']
+        if not location or row['location'] == location:
+            category_totals[row['category_id']] = category_totals.get(row['category_id'], 0) + row['total']
+        category_names[row['category_id']] = row['category__name']
+
+    locations = [
+        (code, name, location_totals.get(code, 0)) for code, name in Event.LOCATION_CHOICES
+    ]
+    categories = sorted(
+        ((cat_id, category_names[cat_id], category_totals.get(cat_id, 0)) for cat_id in category_names),
+        key=lambda item: item[1].lower()
+    )
+    return locations, categories
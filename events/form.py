@@ -1,5 +1,7 @@
 from django import forms
-from events.models import Category, Event, RSVP
+from django.utils import timezone
+from events.models import Event
+from events.categories import category_choices
 
 
 class StyleFormMixin:
@@ -21,6 +23,9 @@ class StyleFormMixin:
             elif isinstance(widget, forms.TimeInput):
                 widget.attrs['class'] = self.default_classes
                 widget.attrs['type'] = 'time'
+            elif isinstance(widget, forms.DateTimeInput):
+                widget.attrs['class'] = self.default_classes
+                widget.attrs['type'] = 'datetime-local'
             elif isinstance(widget, forms.CheckboxSelectMultiple):
                 widget.attrs['class'] = 'space-y-2'
 
@@ -32,11 +37,12 @@ class EventForm(StyleFormMixin, forms.ModelForm):
         label='Use Existing Category',
         widget=forms.CheckboxInput(attrs={'class': 'mr-2'})
     )
-    existing_category = forms.ModelChoiceField(
-        queryset=Category.objects.all(),
+    # choices come from the cached (id, name) list, so rendering runs no query
+    existing_category = forms.TypedChoiceField(
+        coerce=int,
+        empty_value=None,
         required=False,
         label='Select Category',
-        empty_label="-- Select Category --"
     )
     new_category_name = forms.CharField(
         max_length=250,
@@ -52,16 +58,24 @@ class EventForm(StyleFormMixin, forms.ModelForm):
 
     class Meta:
         model = Event
-        fields = ['image', 'name', 'description', 'date', 'time', 'location']
+        fields = ['image', 'name', 'description', 'starts_at', 'ends_at', 'location', 'recurrence', 'recurrence_until']
         widgets = {
             'name': forms.TextInput(attrs={'placeholder': 'Enter event name'}),
             'description': forms.Textarea(attrs={'placeholder': 'Enter event description'}),
-            'date': forms.DateInput(attrs={'type': 'date'}),
-            'time': forms.TimeInput(attrs={'type': 'time'}),
+            'starts_at': forms.DateTimeInput(attrs={'type': 'datetime-local'}, format='%Y-%m-%dT%H:%M'),
+            'ends_at': forms.DateTimeInput(attrs={'type': 'datetime-local'}, format='%Y-%m-%dT%H:%M'),
+            'recurrence_until': forms.DateInput(attrs={'type': 'date'}),
+        }
+        labels = {
+            'starts_at': 'Starts',
+            'ends_at': 'Ends (optional)',
+            'recurrence': 'Repeats',
+            'recurrence_until': 'Repeat Until (optional)',
         }
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
+        self.fields['existing_category'].choices = [('', "-- Select Category --")] + category_choices()
         self.apply_style_widgets()
         self.fields['image'].required = False
 
@@ -75,6 +89,17 @@ class EventForm(StyleFormMixin, forms.ModelForm):
             raise forms.ValidationError("Please select an existing category.")
         if not use_existing and not new_cat_name:
             raise forms.ValidationError("Please provide a name for the new category.")
+
+        start = cleaned_data.get('starts_at')
+        end = cleaned_data.get('ends_at')
+        if start and end and end <= start:
+            raise forms.ValidationError("The event must end after it starts.")
+
+        until = cleaned_data.get('recurrence_until')
+        if cleaned_data.get('recurrence') == 'NONE':
+            cleaned_data['recurrence_until'] = None
+        elif start and until and until < timezone.localtime(start).date():
+            raise forms.ValidationError("Repeat until date must be after the event date.")
         return cleaned_data
 class EventSearchForm(forms.Form):
     search = forms.CharField(
@@ -84,10 +109,10 @@ class EventSearchForm(forms.Form):
             'class': 'w-full px-4 py-2 border border-gray-300 rounded-lg'
         })
     )
-    category = forms.ModelChoiceField(
-        queryset=Category.objects.all(),
+    category = forms.TypedChoiceField(
+        coerce=int,
+        empty_value=None,
         required=False,
-        empty_label="All Categories",
         widget=forms.Select(attrs={
             'class': 'w-full px-4 py-2 border border-gray-300 rounded-lg'
         })
@@ -98,4 +123,8 @@ class EventSearchForm(forms.Form):
         widget=forms.Select(attrs={
             'class': 'w-full px-4 py-2 border border-gray-300 rounded-lg'
         })
-    )
\ No newline at end of file
+    )
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fields['category'].choices = [('', "All Categories")] + category_choices()
\ No newline at end of file
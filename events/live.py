@@ -0,0 +1,116 @@
+import asyncio
+import contextvars
+import logging
+import threading
+from django.core.cache import cache
+from events.models import RSVP
+
+
+POLL_SECONDS = 1
+VERSION_TIMEOUT = 86400
+
+logger = logging.getLogger(__name__)
+
+
+def version_key(event_id):
+    return f"live:{event_id}"
+
+
+class CountBroadcaster:
+    """
+    Fans confirmed-RSVP counts out to the open SSE streams of this process.
+
+    RSVP signals call notify_changed() once per committed change, which only
+    bumps the event's version in the shared cache, so every worker sees it.
+    While a worker has streams open it polls the versions of their events
+    once a second with one get_many; for each event that moved it runs a
+    single COUNT query and hands the result to all of its subscribers, so
+    the number of listeners never changes the number of DB reads.
+    Subscribers only ever need the latest value, so each queue holds one item.
+    """
+
+    def __init__(self):
+        self._subscribers = {}
+        self._versions = {}
+        self._poller = None
+        self._lock = threading.Lock()
+
+    def subscribe(self, event_id, loop=None):
+        loop = loop or asyncio.get_running_loop()
+        queue = asyncio.Queue(maxsize=1)
+        with self._lock:
+            self._subscribers.setdefault(event_id, set()).add((loop, queue))
+        # called from the stream's own loop, the poller lives there until the last stream closes.
+        # It starts from an empty context: the request's would take its sync thread along, which
+        # is gone once that request ends.
+        if loop.is_running() and (self._poller is None or self._poller.done()):
+            self._poller = contextvars.Context().run(loop.create_task, self._run())
+        return queue
+
+    def unsubscribe(self, event_id, queue):
+        with self._lock:
+            subscribers = self._subscribers.get(event_id, set())
+            subscribers.difference_update({item for item in subscribers if item[1] is queue})
+            if not subscribers:
+                self._subscribers.pop(event_id, None)
+                self._versions.pop(event_id, None)
+
+    def subscriber_count(self, event_id):
+        return len(self._subscribers.get(event_id, ()))
+
+    def publish(self, event_id, count):
+        with self._lock:
+            subscribers = list(self._subscribers.get(event_id, ()))
+        closed = []
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(_put_latest, queue, count)
+            except RuntimeError:
+                # the stream's loop went away without unsubscribing (server shutdown, dropped worker)
+                closed.append(queue)
+        for queue in closed:
+            self.unsubscribe(event_id, queue)
+
+    def notify_changed(self, event_id):
+        key = version_key(event_id)
+        cache.add(key, 0, VERSION_TIMEOUT)
+        try:
+            cache.incr(key)
+        except ValueError:
+            # expired between add() and incr()
+            cache.set(key, 1, VERSION_TIMEOUT)
+
+    async def poll(self):
+        """Publish the count of every watched event whose version moved since the last poll."""
+        with self._lock:
+            event_ids = list(self._subscribers)
+        if not event_ids:
+            return
+        versions = await cache.aget_many([version_key(event_id) for event_id in event_ids])
+        for event_id in event_ids:
+            version = versions.get(version_key(event_id))
+            if version == self._versions.get(event_id):
+                continue
+            count = await RSVP.objects.filter(event_id=event_id, is_confirmed=True).acount()
+            self.publish(event_id, count)
+            with self._lock:
+                if event_id in self._subscribers:
+                    self._versions[event_id] = version
+
+    async def _run(self):
+        while self._subscribers:
+            await asyncio.sleep(POLL_SECONDS)
+            try:
+                await self.poll()
+            except Exception:
+                # a cache or database hiccup: the streams stay open, the next tick tries again
+                logger.exception("Polling live RSVP counts failed")
+
+
+def _put_latest(queue, value):
+    if queue.full():
+        queue.get_nowait()
+    queue.put_nowait(value)
+
+
+broadcaster = CountBroadcaster()
@@ -0,0 +1,22 @@
+import time
+from django.core.management.base import BaseCommand
+from events.archive import DEFAULT_RETENTION_DAYS, archive_events
+
+
+class Command(BaseCommand):
+    help = "Move events older than the retention window, with their RSVPs, into the archive tables."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=DEFAULT_RETENTION_DAYS, help="Retention window in days.")
+        parser.add_argument('--batch-size', type=int, default=200, help="Events moved per transaction.")
+        parser.add_argument('--dry-run', action='store_true', help="Only count what would be archived.")
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        events, rsvps = archive_events(
+            days=options['days'], batch_size=options['batch_size'], dry_run=options['dry_run']
+        )
+        prefix = "[dry run] " if options['dry_run'] else ""
+        self.stdout.write(self.style.SUCCESS(
+            f"{prefix}Archived {events} events and {rsvps} RSVPs in {time.monotonic() - started:.1f}s."
+        ))
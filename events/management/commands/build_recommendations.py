@@ -0,0 +1,18 @@
+import time
+from django.core.management.base import BaseCommand
+from events.recommendations import build_recommendations
+
+
+class Command(BaseCommand):
+    help = "Rebuild the 'events you may like' table from co-RSVP similarity (needs numpy and scipy)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--top-k', type=int, default=10, help="Neighbours stored per event.")
+        parser.add_argument('--min-score', type=float, default=0.0, help="Drop neighbours at or below this cosine score.")
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        stored = build_recommendations(k=options['top_k'], min_score=options['min_score'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Stored {stored} event neighbours in {time.monotonic() - started:.2f}s."
+        ))
@@ -0,0 +1,27 @@
+import time
+from django.core.management.base import BaseCommand
+from events.static_pages import EXPORT_BATCH_SIZE, export_all, export_dirty
+
+
+class Command(BaseCommand):
+    help = (
+        "Pre-render anonymous event pages and per-location listings into STATIC_PAGES_ROOT. "
+        "By default only the pages queued by Event/RSVP/Category changes are regenerated; "
+        "run with --all once a day, since the listings show a moving date window."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true', help="Render every page, not just the queued ones.")
+        parser.add_argument('--batch-size', type=int, default=EXPORT_BATCH_SIZE, help="Queued pages per batch.")
+        parser.add_argument('--root', help="Output directory (defaults to STATIC_PAGES_ROOT).")
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        if options['all']:
+            writer = export_all(options['root'])
+        else:
+            writer = export_dirty(options['root'], batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Wrote {writer.written} pages, {writer.unchanged} unchanged, {writer.removed} removed "
+            f"in {time.monotonic() - started:.1f}s."
+        ))
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+from events.categories import merge_duplicates
+
+
+class Command(BaseCommand):
+    help = (
+        "Merge categories whose names differ only by case or surrounding spaces, "
+        "moving their events to the oldest one."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help="Only report what would be merged.")
+
+    def handle(self, *args, **options):
+        dry_run = options['dry_run']
+        groups, removed, moved = merge_duplicates(dry_run=dry_run)
+        prefix = "[dry run] " if dry_run else ""
+        self.stdout.write(self.style.SUCCESS(
+            f"{prefix}{groups} duplicate group(s): {removed} categories removed, {moved} events reassigned."
+        ))
@@ -0,0 +1,14 @@
+import time
+from django.core.management.base import BaseCommand
+from events.rollups import run_rollup
+
+
+class Command(BaseCommand):
+    help = "Fold new RSVP activity into the per event per day rollup table. Run periodically (e.g. every 5 minutes)."
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        touched = run_rollup()
+        self.stdout.write(self.style.SUCCESS(
+            f"Updated {touched} event/day rows in {time.monotonic() - started:.2f}s."
+        ))
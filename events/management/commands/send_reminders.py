@@ -0,0 +1,26 @@
+import time
+from django.core.management.base import BaseCommand
+from events.reminders import send_reminders
+
+
+class Command(BaseCommand):
+    help = "Email confirmed attendees of events starting soon. Safe to run from cron; reruns skip reminded RSVPs."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hours', type=int, default=24, help="Remind about events starting within this many hours.")
+        parser.add_argument('--batch-size', type=int, default=500, help="Emails sent (and marked) per batch.")
+        parser.add_argument('--dry-run', action='store_true', help="Only count pending reminders.")
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        events, sent = send_reminders(
+            hours=options['hours'], batch_size=options['batch_size'], dry_run=options['dry_run']
+        )
+        elapsed = time.monotonic() - started
+        if options['dry_run']:
+            self.stdout.write(f"[dry run] {sent} reminders pending for {events} events.")
+            return
+        rate = sent / elapsed if elapsed else sent
+        self.stdout.write(self.style.SUCCESS(
+            f"Sent {sent} reminders for {events} events in {elapsed:.1f}s ({rate:.0f}/s)."
+        ))
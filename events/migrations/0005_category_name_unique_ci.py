@@ -0,0 +1,42 @@
+# Generated by Django 6.0.1 on 2026-10-19 10:00
+
+import django.db.models.functions.text
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import Lower, Trim
+
+
+def merge_duplicate_categories(apps, schema_editor):
+    # the unique index can't be built while duplicates exist; names compare like
+    # get_or_create_category does, so "Music " and "music" are duplicates too
+    Category = apps.get_model('events', 'Category')
+    Event = apps.get_model('events', 'Event')
+    keys = (
+        Category.objects.annotate(key=Trim(Lower('name')))
+        .values('key')
+        .annotate(total=Count('id'))
+        .filter(total__gt=1)
+        .values_list('key', flat=True)
+    )
+    for key in list(keys):
+        ids = list(
+            Category.objects.annotate(key=Trim(Lower('name'))).filter(key=key).order_by('id').values_list('id', flat=True)
+        )
+        Event.objects.filter(category_id__in=ids[1:]).update(category_id=ids[0])
+        Category.objects.filter(id__in=ids[1:]).delete()
+    Category.objects.exclude(name=Trim('name')).update(name=Trim('name'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0004_event_recurrence'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicate_categories, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='category',
+            constraint=models.UniqueConstraint(django.db.models.functions.text.Lower('name'), name='unique_category_name_ci'),
+        ),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 6.0.1 on 2026-10-19 10:00
+
+import django.db.models.deletion
+import django.db.models.functions.datetime
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0006_soft_delete'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedEvent',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('image', models.CharField(blank=True, max_length=100)),
+                ('name', models.CharField(max_length=250)),
+                ('description', models.TextField()),
+                ('date', models.DateField()),
+                ('time', models.TimeField()),
+                ('location', models.CharField(choices=[('DHAKA', 'Dhaka'), ('SYLHET', 'Sylhet'), ('CHOTTOGRAM', 'Chottogram'), ('RAJSHAHI', 'Rajshahi'), ('MYMENSINGH', 'Mymensingh'), ('RANGPUR', 'Rangpur'), ('KHULNA', 'Khulna'), ('BARISHAL', 'Barishal')], default='DHAKA', max_length=250)),
+                ('recurrence', models.CharField(choices=[('NONE', 'Does not repeat'), ('DAILY', 'Daily'), ('WEEKLY', 'Weekly'), ('MONTHLY', 'Monthly')], default='NONE', max_length=10)),
+                ('recurrence_until', models.DateField(blank=True, null=True)),
+                ('parent_id', models.BigIntegerField(blank=True, null=True)),
+                ('archived_at', models.DateTimeField(db_default=django.db.models.functions.datetime.Now())),
+                ('category', models.ForeignKey(db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='events.category')),
+                ('organizer', models.ForeignKey(db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ArchivedRSVP',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('rsvp_date', models.DateTimeField()),
+                ('is_confirmed', models.BooleanField(default=False)),
+                ('token', models.UUIDField(unique=True)),
+                ('event', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='rsvps', to='events.archivedevent')),
+                ('user', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='archived_rsvps', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Archived RSVP',
+                'verbose_name_plural': 'Archived RSVPs',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='archivedevent',
+            index=models.Index(fields=['date'], name='archived_event_date_idx'),
+        ),
+    ]
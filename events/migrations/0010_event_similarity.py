@@ -0,0 +1,27 @@
+# Generated by Django 6.0.1 on 2026-10-19 10:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0009_rsvp_rollups'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EventSimilarity',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField()),
+                ('event', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='neighbors', to='events.event')),
+                ('similar_event', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='neighbor_of', to='events.event')),
+            ],
+            options={
+                'verbose_name_plural': 'Event similarities',
+                'constraints': [models.UniqueConstraint(fields=('event', 'similar_event'), name='unique_event_similarity')],
+            },
+        ),
+    ]
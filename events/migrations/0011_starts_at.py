@@ -0,0 +1,53 @@
+# Generated by Django 6.0.1 on 2026-10-19 10:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0010_event_similarity'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='archivedevent',
+            name='ends_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='archivedevent',
+            name='starts_at',
+            field=models.DateTimeField(null=True),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='ends_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='starts_at',
+            field=models.DateTimeField(null=True),
+        ),
+        migrations.AlterField(
+            model_name='archivedevent',
+            name='date',
+            field=models.DateField(null=True),
+        ),
+        migrations.AlterField(
+            model_name='archivedevent',
+            name='time',
+            field=models.TimeField(null=True),
+        ),
+        migrations.AlterField(
+            model_name='event',
+            name='date',
+            field=models.DateField(null=True),
+        ),
+        migrations.AlterField(
+            model_name='event',
+            name='time',
+            field=models.TimeField(null=True),
+        ),
+    ]
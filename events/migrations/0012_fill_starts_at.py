@@ -0,0 +1,52 @@
+from datetime import datetime
+from django.db import migrations, transaction
+from django.utils import timezone
+
+
+BATCH_SIZE = 1000
+
+
+def _batches(model, **filters):
+    # keyset walk over the primary key, one short transaction per batch
+    last_id = 0
+    while True:
+        with transaction.atomic():
+            rows = list(model.objects.filter(id__gt=last_id, **filters).order_by('id')[:BATCH_SIZE])
+            if not rows:
+                return
+            yield rows
+        last_id = rows[-1].id
+
+
+def fill_starts_at(apps, schema_editor):
+    tz = timezone.get_default_timezone()
+    for name in ('Event', 'ArchivedEvent'):
+        model = apps.get_model('events', name)
+        for rows in _batches(model, starts_at__isnull=True):
+            for row in rows:
+                row.starts_at = timezone.make_aware(datetime.combine(row.date, row.time), tz)
+            model.objects.bulk_update(rows, ['starts_at'])
+
+
+def fill_date_time(apps, schema_editor):
+    tz = timezone.get_default_timezone()
+    for name in ('Event', 'ArchivedEvent'):
+        model = apps.get_model('events', name)
+        for rows in _batches(model, starts_at__isnull=False):
+            for row in rows:
+                local = timezone.localtime(row.starts_at, tz)
+                row.date, row.time = local.date(), local.time()
+            model.objects.bulk_update(rows, ['date', 'time'])
+
+
+class Migration(migrations.Migration):
+    # batches commit one by one, so a large table is never locked in a single transaction
+    atomic = False
+
+    dependencies = [
+        ('events', '0011_starts_at'),
+    ]
+
+    operations = [
+        migrations.RunPython(fill_starts_at, fill_date_time),
+    ]
@@ -0,0 +1,65 @@
+# Generated by Django 6.0.1 on 2026-10-19 10:00
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0012_fill_starts_at'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='event',
+            name='unique_event_occurrence',
+        ),
+        migrations.RemoveIndex(
+            model_name='archivedevent',
+            name='archived_event_date_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='event',
+            name='event_recurrence_date_idx',
+        ),
+        migrations.RemoveField(
+            model_name='archivedevent',
+            name='date',
+        ),
+        migrations.RemoveField(
+            model_name='archivedevent',
+            name='time',
+        ),
+        migrations.RemoveField(
+            model_name='event',
+            name='date',
+        ),
+        migrations.RemoveField(
+            model_name='event',
+            name='time',
+        ),
+        migrations.AlterField(
+            model_name='archivedevent',
+            name='starts_at',
+            field=models.DateTimeField(),
+        ),
+        migrations.AlterField(
+            model_name='event',
+            name='starts_at',
+            field=models.DateTimeField(),
+        ),
+        migrations.AddIndex(
+            model_name='archivedevent',
+            index=models.Index(fields=['starts_at'], name='archived_event_starts_at_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['starts_at'], name='event_starts_at_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='event',
+            constraint=models.UniqueConstraint(fields=('parent', 'starts_at'), name='unique_event_occurrence'),
+        ),
+    ]
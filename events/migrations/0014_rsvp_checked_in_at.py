@@ -0,0 +1,18 @@
+# Generated by Django 6.0.1 on 2026-10-19 10:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0013_drop_event_date_time'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='rsvp',
+            name='checked_in_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
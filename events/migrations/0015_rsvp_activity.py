@@ -0,0 +1,30 @@
+# Generated by Django 6.0.1 on 2026-10-19 10:00
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0014_rsvp_checked_in_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RSVPActivity',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('action', models.CharField(choices=[('created', 'RSVP created'), ('confirmed', 'RSVP confirmed'), ('deleted', 'RSVP deleted'), ('event_cancelled', 'Event cancelled')], max_length=20)),
+                ('at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('event_id', models.BigIntegerField()),
+                ('user_id', models.BigIntegerField(blank=True, null=True)),
+                ('rsvp_id', models.BigIntegerField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': 'RSVP activity',
+                'verbose_name_plural': 'RSVP activity',
+                'indexes': [models.Index(fields=['at'], name='rsvp_activity_at_idx'), models.Index(fields=['event_id', 'at'], name='rsvp_activity_event_idx')],
+            },
+        ),
+    ]
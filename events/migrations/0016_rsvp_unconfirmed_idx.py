@@ -0,0 +1,19 @@
+# Generated by Django 6.0.1 on 2026-10-19 10:00
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0015_rsvp_activity'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='rsvp',
+            index=models.Index(condition=models.Q(('is_confirmed', False)), fields=['rsvp_date'], name='rsvp_unconfirmed_idx'),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 6.0.1 on 2026-10-19 10:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0017_event_location_starts_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DirtyPage',
+            fields=[
+                ('path', models.CharField(max_length=100, primary_key=True, serialize=False)),
+                ('marked_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 6.0.1 on 2026-10-19 10:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0018_dirty_page'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='archivedrsvp',
+            name='checked_in_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='archivedrsvp',
+            name='confirmed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='archivedrsvp',
+            name='reminded_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
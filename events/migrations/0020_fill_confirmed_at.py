@@ -0,0 +1,58 @@
+# Generated by Django 6.0.1 on 2026-10-19 10:00
+
+from collections import Counter
+from django.db import migrations, transaction
+from django.db.models import F
+from django.utils import timezone
+
+
+BATCH_SIZE = 1000
+
+
+def _batches(model, **filters):
+    # keyset walk over the primary key, one short transaction per batch
+    last_id = 0
+    while True:
+        with transaction.atomic():
+            rows = list(model.objects.filter(id__gt=last_id, **filters).order_by('id')[:BATCH_SIZE])
+            if not rows:
+                return
+            yield rows
+        last_id = rows[-1].id
+
+
+def fill_confirmed_at(apps, schema_editor):
+    """
+    RSVPs confirmed before confirmed_at existed get their rsvp_date. The ones
+    the rollup's high-water mark has already passed are added to
+    EventDailyStats here, in the same transaction, since rollup_rsvps won't
+    look back at them.
+    """
+    RSVP = apps.get_model('events', 'RSVP')
+    EventDailyStats = apps.get_model('events', 'EventDailyStats')
+    RollupWatermark = apps.get_model('events', 'RollupWatermark')
+    mark = RollupWatermark.objects.filter(name='rsvp_confirmed').values_list('value', flat=True).first()
+    for rows in _batches(RSVP, is_confirmed=True, confirmed_at__isnull=True):
+        missed = Counter()
+        for row in rows:
+            row.confirmed_at = row.rsvp_date
+            if mark is not None and row.rsvp_date <= mark:
+                missed[(row.event_id, timezone.localdate(row.rsvp_date))] += 1
+        RSVP.objects.bulk_update(rows, ['confirmed_at'])
+        for (event_id, day), total in missed.items():
+            stats, _ = EventDailyStats.objects.get_or_create(event_id=event_id, day=day)
+            EventDailyStats.objects.filter(id=stats.id).update(confirmed=F('confirmed') + total)
+
+
+class Migration(migrations.Migration):
+    # batches commit one by one, so a large table is never locked in a single transaction
+    atomic = False
+
+    dependencies = [
+        ('events', '0019_archived_rsvp_history'),
+    ]
+
+    operations = [
+        # backfilled rows can't be told apart from real confirmations afterwards
+        migrations.RunPython(fill_confirmed_at, migrations.RunPython.noop),
+    ]
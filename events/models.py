@@ -1,6 +1,9 @@
 from django.db import models
+from django.db.models.functions import Lower, Now
 from django.contrib.auth.models import User
+from django.utils import timezone
 import uuid
+from datetime import datetime
 
 
 class Category(models.Model):
@@ -12,9 +15,55 @@ class Category(models.Model):
 
     class Meta:
         verbose_name_plural = "Categories"
+        constraints = [
+            models.UniqueConstraint(Lower('name'), name='unique_category_name_ci')
+        ]
+
+
+class ScheduleMixin:
+    """
+    Local `date` and `time` views of starts_at, for templates and the recurrence
+    code, which work in calendar days. Setting one moves starts_at (and ends_at
+    with it); both can also be passed to the constructor.
+    """
+
+    @property
+    def date(self):
+        if self.starts_at is None:
+            return getattr(self, '_pending_date', None)
+        return timezone.localtime(self.starts_at).date()
+
+    @date.setter
+    def date(self, value):
+        self._move_start(value, self.time)
+
+    @property
+    def time(self):
+        if self.starts_at is None:
+            return getattr(self, '_pending_time', None)
+        return timezone.localtime(self.starts_at).time()
+
+    @time.setter
+    def time(self, value):
+        self._move_start(self.date, value)
+
+    def _move_start(self, day, at):
+        if day is None or at is None:
+            self._pending_date, self._pending_time = day, at
+            return
+        starts_at = timezone.make_aware(datetime.combine(day, at))
+        if self.starts_at is not None and self.ends_at is not None:
+            self.ends_at += starts_at - self.starts_at
+        self.starts_at = starts_at
+
 
+class EventManager(models.Manager):
+    # soft-deleted events are hidden everywhere until purge_deleted removes them
+    def get_queryset(self):
+        return super().get_queryset().filter(deleted_at__isnull=True)
 
-class Event(models.Model):
+
+class Event(ScheduleMixin, models.Model):
     LOCATION_CHOICES = [
         ("DHAKA", "Dhaka"),
         ("SYLHET", "Sylhet"),
@@ -25,15 +74,33 @@ class Event(models.Model):
         ("KHULNA", "Khulna"),
         ("BARISHAL", "Barishal")
     ]
+    RECURRENCE_CHOICES = [
+        ("NONE", "Does not repeat"),
+        ("DAILY", "Daily"),
+        ("WEEKLY", "Weekly"),
+        ("MONTHLY", "Monthly"),
+    ]
 
     image = models.ImageField(upload_to='images/events/', default='images/events.jpeg', blank=True)
     name = models.CharField(max_length=250)
     description = models.TextField()
-    date = models.DateField()
-    time = models.TimeField()
+    starts_at = models.DateTimeField()
+    ends_at = models.DateTimeField(null=True, blank=True)
     location = models.CharField(max_length=250, choices=LOCATION_CHOICES, default="DHAKA")
     category = models.ForeignKey(Category, on_delete=models.CASCADE, default=1)
 
+    #recurrence fields, occurrences are expanded on read (events/recurrence.py)
+    recurrence = models.CharField(max_length=10, choices=RECURRENCE_CHOICES, default="NONE")
+    recurrence_until = models.DateField(null=True, blank=True)
+    # set on an occurrence that was materialized because someone RSVP'd to it
+    parent = models.ForeignKey(
+        'self',
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='occurrences'
+    )
+
     #organizer field
     organizer = models.ForeignKey(
         User,
@@ -43,13 +110,62 @@ class Event(models.Model):
         related_name='organized_events'
     )
 
+    deleted_at = models.DateTimeField(null=True, blank=True)
+
+    objects = EventManager()
+    all_objects = models.Manager()
+
+    # True on the in-memory copies produced by expand_occurrences
+    is_virtual = False
+    is_archived = False
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['starts_at'], name='event_starts_at_idx'),
+            # admin location filter, optionally narrowed by date
+            models.Index(fields=['location', 'starts_at'], name='event_location_starts_idx'),
+            models.Index(fields=['deleted_at'], name='event_deleted_idx', condition=models.Q(deleted_at__isnull=False)),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['parent', 'starts_at'], name='unique_event_occurrence')
+        ]
+
     def __str__(self):
         return self.name
 
+    @property
+    def is_recurring(self):
+        return self.recurrence != "NONE"
+
+    def soft_delete(self):
+        """Hide the event (and its materialized occurrences) now, leave the rows for purge_deleted."""
+        self.deleted_at = timezone.now()
+        self.save(update_fields=['deleted_at'])
+        Event.all_objects.filter(parent=self, deleted_at__isnull=True).update(deleted_at=self.deleted_at)
+
     @property
     def participant_count(self):
         return self.rsvps.filter(is_confirmed=True).count()
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        event = super().from_db(db, field_names, values)
+        # lets the static pages tell a move to another location apart from any other save
+        event._saved_location = event.__dict__.get('location')
+        return event
+
+
+class RSVPManager(models.Manager):
+    # a deleted user's RSVPs stop counting right away, purge_deleted removes them later
+    def get_queryset(self):
+        return super().get_queryset().filter(event__deleted_at__isnull=True, user__deletion__isnull=True)
+
+
+def count_rsvps(**filters):
+    """Count('rsvps') for event annotations, without the RSVPs of users awaiting purge_deleted."""
+    conditions = {f'rsvps__{lookup}': value for lookup, value in filters.items()}
+    return models.Count('rsvps', filter=models.Q(rsvps__user__deletion__isnull=True, **conditions))
+
 
 class RSVP(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='rsvps')
@@ -58,14 +174,185 @@ class RSVP(models.Model):
 
     #email confirmation field
     is_confirmed = models.BooleanField(default=False)
+    confirmed_at = models.DateTimeField(null=True, blank=True)
     token = models.UUIDField(default=uuid.uuid4, editable=False, unique=True)
+    # set by send_reminders, so reruns skip people who already got one
+    reminded_at = models.DateTimeField(null=True, blank=True)
+    # set at the door (events/checkin.py)
+    checked_in_at = models.DateTimeField(null=True, blank=True)
+
+    objects = RSVPManager()
+    all_objects = models.Manager()
 
     class Meta:
         constraints = [
             models.UniqueConstraint(fields=['user', 'event'], name='unique_user_event_rsvp')
         ]
+        # high-water mark scans of rollup_rsvps
+        indexes = [
+            models.Index(fields=['rsvp_date'], name='rsvp_date_idx'),
+            models.Index(fields=['confirmed_at'], name='rsvp_confirmed_at_idx'),
+            # purge_stale finds expired confirmations without scanning confirmed rows
+            models.Index(fields=['rsvp_date'], name='rsvp_unconfirmed_idx', condition=models.Q(is_confirmed=False)),
+        ]
         verbose_name = "RSVP"
         verbose_name_plural = "RSVPs"
 
     def __str__(self):
-        return f"{self.user.username} --> {self.event.name}"
\ No newline at end of file
+        return f"{self.user.username} --> {self.event.name}"
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        rsvp = super().from_db(db, field_names, values)
+        # lets the activity log tell a confirmation apart from any other save
+        rsvp._was_confirmed = rsvp.__dict__.get('is_confirmed')
+        return rsvp
+
+# Append-only history of RSVPs, written in batches by events/activity.py.
+# Plain ids instead of FKs: entries outlive the RSVPs and events they describe.
+class RSVPActivity(models.Model):
+    CREATED = 'created'
+    CONFIRMED = 'confirmed'
+    DELETED = 'deleted'
+    EVENT_CANCELLED = 'event_cancelled'
+    ACTION_CHOICES = [
+        (CREATED, "RSVP created"),
+        (CONFIRMED, "RSVP confirmed"),
+        (DELETED, "RSVP deleted"),
+        (EVENT_CANCELLED, "Event cancelled"),
+    ]
+
+    action = models.CharField(max_length=20, choices=ACTION_CHOICES)
+    at = models.DateTimeField(default=timezone.now)
+    event_id = models.BigIntegerField()
+    user_id = models.BigIntegerField(null=True, blank=True)
+    rsvp_id = models.BigIntegerField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['at'], name='rsvp_activity_at_idx'),
+            models.Index(fields=['event_id', 'at'], name='rsvp_activity_event_idx'),
+        ]
+        verbose_name = "RSVP activity"
+        verbose_name_plural = "RSVP activity"
+
+    def __str__(self):
+        return f"{self.at:%Y-%m-%d %H:%M} {self.action} event={self.event_id} user={self.user_id}"
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            raise ValueError("RSVP activity is append-only.")
+        super().save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        raise ValueError("RSVP activity is append-only.")
+
+
+# Per event per day RSVP totals, maintained incrementally by rollup_rsvps.
+# Dashboard trend charts read only from here.
+class EventDailyStats(models.Model):
+    event = models.ForeignKey(Event, on_delete=models.CASCADE, related_name='daily_stats')
+    day = models.DateField()
+    created = models.PositiveIntegerField(default=0)
+    confirmed = models.PositiveIntegerField(default=0)
+    cancelled = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['event', 'day'], name='unique_event_daily_stats')
+        ]
+        indexes = [
+            models.Index(fields=['day'], name='event_daily_stats_day_idx'),
+        ]
+        verbose_name_plural = "Event daily stats"
+
+    def __str__(self):
+        return f"{self.event_id} @ {self.day}"
+
+
+# Top-K co-RSVP neighbours per event, rebuilt offline by build_recommendations
+class EventSimilarity(models.Model):
+    event = models.ForeignKey(Event, on_delete=models.CASCADE, related_name='neighbors')
+    similar_event = models.ForeignKey(Event, on_delete=models.CASCADE, related_name='neighbor_of')
+    score = models.FloatField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['event', 'similar_event'], name='unique_event_similarity')
+        ]
+        verbose_name_plural = "Event similarities"
+
+    def __str__(self):
+        return f"{self.event_id} ~ {self.similar_event_id} ({self.score:.2f})"
+
+
+class RollupWatermark(models.Model):
+    name = models.CharField(max_length=50, unique=True)
+    value = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.name}: {self.value}"
+
+
+# Pre-rendered pages waiting to be regenerated by export_pages (events/static_pages.py).
+# One row per page path; marking an already queued page is a no-op.
+class DirtyPage(models.Model):
+    path = models.CharField(max_length=100, primary_key=True)
+    marked_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return self.path
+
+
+# Cold storage for events past the retention window (see events/archive.py).
+# Rows keep their original ids; FKs are unconstrained so categories/users can
+# still be deleted without touching the archive.
+class ArchivedEvent(ScheduleMixin, models.Model):
+    id = models.BigIntegerField(primary_key=True)
+    image = models.CharField(max_length=100, blank=True)
+    name = models.CharField(max_length=250)
+    description = models.TextField()
+    starts_at = models.DateTimeField()
+    ends_at = models.DateTimeField(null=True, blank=True)
+    location = models.CharField(max_length=250, choices=Event.LOCATION_CHOICES, default="DHAKA")
+    category = models.ForeignKey(
+        Category, on_delete=models.DO_NOTHING, db_constraint=False, null=True, related_name='+'
+    )
+    organizer = models.ForeignKey(
+        User, on_delete=models.DO_NOTHING, db_constraint=False, null=True, related_name='+'
+    )
+    recurrence = models.CharField(max_length=10, choices=Event.RECURRENCE_CHOICES, default="NONE")
+    recurrence_until = models.DateField(null=True, blank=True)
+    parent_id = models.BigIntegerField(null=True, blank=True)
+    archived_at = models.DateTimeField(db_default=Now())
+
+    is_archived = True
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['starts_at'], name='archived_event_starts_at_idx'),
+        ]
+
+    def __str__(self):
+        return self.name
+
+
+class ArchivedRSVP(models.Model):
+    id = models.BigIntegerField(primary_key=True)
+    user = models.ForeignKey(
+        User, on_delete=models.DO_NOTHING, db_constraint=False, related_name='archived_rsvps'
+    )
+    event = models.ForeignKey(ArchivedEvent, on_delete=models.CASCADE, related_name='rsvps')
+    rsvp_date = models.DateTimeField()
+    is_confirmed = models.BooleanField(default=False)
+    confirmed_at = models.DateTimeField(null=True, blank=True)
+    token = models.UUIDField(unique=True)
+    reminded_at = models.DateTimeField(null=True, blank=True)
+    checked_in_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = "Archived RSVP"
+        verbose_name_plural = "Archived RSVPs"
+
+    def __str__(self):
+        return f"{self.user_id} --> {self.event.name}"
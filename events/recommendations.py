@@ -0,0 +1,81 @@
+from array import array
+import numpy as np
+from scipy import sparse
+from django.db import transaction
+from events.models import Event, EventSimilarity, RSVP
+
+
+def load_pairs(chunk_size=20000):
+    """Stream (user_id, event_id) of every RSVP into two int64 arrays in one pass."""
+    users, events = array('q'), array('q')
+    for user_id, event_id in RSVP.objects.values_list('user_id', 'event_id').iterator(chunk_size=chunk_size):
+        users.append(user_id)
+        events.append(event_id)
+    return np.frombuffer(users, dtype=np.int64), np.frombuffer(events, dtype=np.int64)
+
+
+def item_similarity(user_ids, event_ids):
+    """
+    Cosine similarity between events over the users who RSVP'd to them.
+    Returns (event ids, sparse events x events similarity matrix, zero diagonal).
+    """
+    users, user_index = np.unique(user_ids, return_inverse=True)
+    events, event_index = np.unique(event_ids, return_inverse=True)
+    matrix = sparse.csr_matrix(
+        (np.ones(len(user_index), dtype=np.float32), (user_index, event_index)),
+        shape=(len(users), len(events))
+    )
+    matrix.data[:] = 1  # duplicate pairs collapse to a single RSVP
+
+    co_counts = (matrix.T @ matrix).tocsr()
+    norms = np.sqrt(co_counts.diagonal())
+    norms[norms == 0] = 1
+    inverse = sparse.diags(1 / norms)
+    similarity = (inverse @ co_counts @ inverse).tocsr()
+    similarity.setdiag(0)
+    similarity.eliminate_zeros()
+    return events, similarity
+
+
+def top_neighbors(similarity, k):
+    """(row, column, score) arrays holding the k best neighbours of every row."""
+    rows, cols, scores = [], [], []
+    for row in range(similarity.shape[0]):
+        start, end = similarity.indptr[row], similarity.indptr[row + 1]
+        if start == end:
+            continue
+        data = similarity.data[start:end]
+        indices = similarity.indices[start:end]
+        if len(data) > k:
+            best = np.argpartition(-data, k)[:k]
+            data, indices = data[best], indices[best]
+        rows.append(np.full(len(data), row))
+        cols.append(indices)
+        scores.append(data)
+    if not rows:
+        empty = np.array([], dtype=np.int64)
+        return empty, empty, np.array([], dtype=np.float32)
+    return np.concatenate(rows), np.concatenate(cols), np.concatenate(scores)
+
+
+def build_recommendations(k=10, min_score=0.0):
+    """Recompute and store the top-k neighbours of every event. Returns the number of rows stored."""
+    user_ids, event_ids = load_pairs()
+    if not len(event_ids):
+        EventSimilarity.objects.all().delete()
+        return 0
+    events, similarity = item_similarity(user_ids, event_ids)
+    rows, cols, scores = top_neighbors(similarity, k)
+    keep = scores > min_score
+    rows, cols, scores = rows[keep], cols[keep], scores[keep]
+
+    live = set(Event.objects.filter(id__in=events.tolist()).values_list('id', flat=True))
+    objs = [
+        EventSimilarity(event_id=int(events[row]), similar_event_id=int(events[col]), score=float(score))
+        for row, col, score in zip(rows, cols, scores)
+        if events[row] in live and events[col] in live
+    ]
+    with transaction.atomic():
+        EventSimilarity.objects.all().delete()
+        EventSimilarity.objects.bulk_create(objs, batch_size=2000)
+    return len(objs)
@@ -0,0 +1,178 @@
+import calendar
+import copy
+from datetime import date, datetime, timedelta
+from django.db.models import Q
+from django.utils import timezone
+from events.models import Event
+
+
+# How far ahead recurring events are expanded when no window is requested
+DEFAULT_WINDOW_DAYS = 60
+
+
+def default_window(today=None):
+    today = today or timezone.localdate()
+    return today, today + timedelta(days=DEFAULT_WINDOW_DAYS)
+
+
+def parse_window(params, today=None):
+    """Read `start` / `end` (YYYY-MM-DD) from a QueryDict, falling back to the default window."""
+    start, end = default_window(today)
+    try:
+        if params.get('start'):
+            start = date.fromisoformat(params['start'])
+        if params.get('end'):
+            end = date.fromisoformat(params['end'])
+    except ValueError:
+        return default_window(today)
+    if end < start:
+        end = start
+    return start, end
+
+
+def day_start(day):
+    """Aware datetime of local midnight at the start of `day`."""
+    return timezone.make_aware(datetime.combine(day, datetime.min.time()))
+
+
+def starts_between(start, end):
+    """starts_at lookups for local days start..end inclusive, as one half-open range."""
+    return {'starts_at__gte': day_start(start), 'starts_at__lt': day_start(end + timedelta(days=1))}
+
+
+def _add_months(day, months, anchor_day):
+    month_index = day.month - 1 + months
+    year = day.year + month_index // 12
+    month = month_index % 12 + 1
+    return date(year, month, min(anchor_day, calendar.monthrange(year, month)[1]))
+
+
+def occurrence_dates(event, start, end):
+    """Dates between start and end (inclusive) on which `event` takes place."""
+    first = event.date
+    last = end if event.recurrence_until is None else min(end, event.recurrence_until)
+    if first > last:
+        return
+
+    if event.recurrence == "NONE":
+        if first >= start:
+            yield first
+        return
+
+    if event.recurrence in ("DAILY", "WEEKLY"):
+        step = 1 if event.recurrence == "DAILY" else 7
+        current = first
+        if current < start:
+            # jump straight to the first occurrence inside the window
+            steps = -(-(start - current).days // step)
+            current += timedelta(days=steps * step)
+        while current <= last:
+            yield current
+            current += timedelta(days=step)
+        return
+
+    if event.recurrence == "MONTHLY":
+        months = 0
+        if first < start:
+            months = max(0, (start.year - first.year) * 12 + start.month - first.month - 1)
+        current = _add_months(first, months, first.day)
+        while current <= last:
+            if current >= start:
+                yield current
+            months += 1
+            current = _add_months(first, months, first.day)
+
+
+def is_occurrence(event, day):
+    return any(occurrence_dates(event, day, day))
+
+
+def series_window_q(start, end):
+    return ~Q(recurrence="NONE") & Q(starts_at__lt=day_start(end + timedelta(days=1))) & (
+        Q(recurrence_until__isnull=True) | Q(recurrence_until__gte=start)
+    )
+
+
+def window_q(start, end):
+    """Events that have at least one occurrence between start and end."""
+    # both halves are range scans on event_starts_at_idx
+    return Q(recurrence="NONE", **starts_between(start, end)) | series_window_q(start, end)
+
+
+def series_in_window(queryset, start, end):
+    return queryset.filter(series_window_q(start, end))
+
+
+def expand_occurrences(series, start, end):
+    """
+    Turn recurring events into one in-memory copy per occurrence in the window.
+    Occurrences that were already materialized are skipped, since the real row
+    is listed with the one-off events.
+    """
+    series = list(series)
+    if not series:
+        return []
+
+    # soft-deleted occurrences count too: deleting one cancels that date
+    materialized = {
+        (parent_id, timezone.localtime(starts_at).date())
+        for parent_id, starts_at in Event.all_objects.filter(
+            parent__in=series, **starts_between(start, end)
+        ).values_list('parent_id', 'starts_at')
+    }
+
+    occurrences = []
+    for event in series:
+        for day in occurrence_dates(event, start, end):
+            if (event.id, day) in materialized:
+                continue
+            occurrence = copy.copy(event)
+            occurrence.date = day
+            occurrence.is_virtual = True
+            if hasattr(event, 'rsvp_count'):
+                occurrence.rsvp_count = 0
+            occurrences.append(occurrence)
+    return occurrences
+
+
+def events_in_window(queryset, start, end, one_off=None):
+    """
+    One-off events plus expanded occurrences, ordered by start.
+    `one_off` overrides the default one-off queryset (start inside the window).
+    """
+    if one_off is None:
+        one_off = queryset.filter(recurrence="NONE", **starts_between(start, end))
+    events = list(one_off) + expand_occurrences(series_in_window(queryset, start, end), start, end)
+    events.sort(key=lambda e: e.starts_at)
+    return events
+
+
+def materialize_occurrence(series, day):
+    """Create (or fetch) the real Event row for one occurrence of a recurring event."""
+    if not is_occurrence(series, day):
+        return None
+    existing = Event.all_objects.filter(parent=series, **starts_between(day, day)).first()
+    if existing is not None:
+        # a soft-deleted occurrence cancels that date
+        return None if existing.deleted_at else existing
+    template = copy.copy(series)
+    template.date = day
+    occurrence, _ = Event.objects.get_or_create(
+        parent=series,
+        starts_at=template.starts_at,
+        defaults={
+            'ends_at': template.ends_at,
+            'image': series.image,
+            'name': series.name,
+            'description': series.description,
+            'location': series.location,
+            'category_id': series.category_id,
+            'organizer_id': series.organizer_id,
+        }
+    )
+    return occurrence
+
+
+def next_occurrence(event, after=None):
+    after = after or timezone.localdate()
+    return next(occurrence_dates(event, after, after + timedelta(days=366)), None)
@@ -0,0 +1,64 @@
+from datetime import timedelta
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.utils import timezone
+from events.models import Event, RSVP
+
+
+def events_starting_within(hours, now=None):
+    """Ids of events starting between now and now + hours, one range scan on event_starts_at_idx."""
+    now = now or timezone.now()
+    return list(
+        Event.objects.filter(
+            recurrence="NONE", starts_at__gte=now, starts_at__lte=now + timedelta(hours=hours)
+        ).values_list('id', flat=True)
+    )
+
+
+def build_reminder(rsvp):
+    event = rsvp.event
+    return EmailMessage(
+        subject=f"Reminder: {event.name} is coming up",
+        body=(
+            f"Hi {rsvp.user.first_name or rsvp.user.username},\n\n"
+            f"This is a reminder that '{event.name}' starts on {event.date:%d %b %Y} at {event.time:%I:%M %p} "
+            f"in {event.get_location_display()}.\n"
+            f"{settings.FRONTEND_URL}event/{event.id}/\n\n"
+            f"See you there!"
+        ),
+        from_email=settings.EMAIL_HOST_USER,
+        to=[rsvp.user.email],
+    )
+
+
+def send_reminders(hours=24, batch_size=500, dry_run=False):
+    """
+    Email every confirmed attendee of events starting in the next `hours`.
+    RSVPs are streamed with iterator(), mail goes out over one SMTP connection
+    and each batch is marked with reminded_at right after it is sent, so a
+    rerun (or a crash) resends at most one batch. Returns (events, sent).
+    """
+    event_ids = events_starting_within(hours)
+    pending = RSVP.objects.filter(
+        event_id__in=event_ids, is_confirmed=True, reminded_at__isnull=True
+    ).exclude(user__email='').select_related('user', 'event')
+    if dry_run:
+        return len(event_ids), pending.count()
+
+    sent = 0
+    batch = []
+    with get_connection() as connection:
+        for rsvp in pending.iterator(chunk_size=2000):
+            batch.append(rsvp)
+            if len(batch) >= batch_size:
+                sent += _send_batch(connection, batch)
+                batch = []
+        if batch:
+            sent += _send_batch(connection, batch)
+    return len(event_ids), sent
+
+
+def _send_batch(connection, rsvps):
+    connection.send_messages([build_reminder(rsvp) for rsvp in rsvps])
+    RSVP.all_objects.filter(pk__in=[rsvp.pk for rsvp in rsvps]).update(reminded_at=timezone.now())
+    return len(rsvps)
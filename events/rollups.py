@@ -0,0 +1,108 @@
+from datetime import datetime, timedelta
+from django.db import transaction
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+from events.models import Event, EventDailyStats, RSVP, RSVPActivity, RollupWatermark
+
+
+# rows younger than this may still sit in uncommitted transactions, leave them for the next run
+SAFETY_LAG = timedelta(minutes=2)
+
+# (watermark name, source rows, timestamp column, EventDailyStats counter)
+ROLLUPS = [
+    ('rsvp_created', lambda: RSVP.all_objects.all(), 'rsvp_date', 'created'),
+    ('rsvp_confirmed', lambda: RSVP.all_objects.all(), 'confirmed_at', 'confirmed'),
+    ('rsvp_cancelled', lambda: RSVPActivity.objects.filter(action=RSVPActivity.DELETED), 'at', 'cancelled'),
+]
+
+
+def _watermark(name):
+    mark = RollupWatermark.objects.select_for_update().filter(name=name).first()
+    if mark is None:
+        mark = RollupWatermark.objects.create(name=name, value=timezone.make_aware(datetime(2000, 1, 1)))
+    return mark
+
+
+def _apply(deltas):
+    """Add {(event_id, day): {counter: n}} onto EventDailyStats rows."""
+    if not deltas:
+        return
+    live_ids = set(Event.all_objects.filter(id__in={key[0] for key in deltas}).values_list('id', flat=True))
+    deltas = {key: value for key, value in deltas.items() if key[0] in live_ids}
+    existing = {
+        (stats.event_id, stats.day): stats
+        for stats in EventDailyStats.objects.filter(
+            event_id__in={key[0] for key in deltas}, day__in={key[1] for key in deltas}
+        )
+    }
+    to_update, to_create = [], []
+    for key, counters in deltas.items():
+        stats = existing.get(key)
+        if stats is None:
+            to_create.append(EventDailyStats(event_id=key[0], day=key[1], **counters))
+            continue
+        for counter, amount in counters.items():
+            setattr(stats, counter, getattr(stats, counter) + amount)
+        to_update.append(stats)
+    EventDailyStats.objects.bulk_create(to_create, batch_size=1000)
+    EventDailyStats.objects.bulk_update(to_update, ['created', 'confirmed', 'cancelled'], batch_size=1000)
+
+
+def run_rollup(now=None):
+    """
+    Fold RSVP activity since the last run into EventDailyStats. Each counter
+    has its own high-water mark; the grouped scan, the upsert and the mark move
+    happen in one transaction, so every row is counted exactly once.
+    Returns the number of (event, day) rows touched.
+    """
+    upper = (now or timezone.now()) - SAFETY_LAG
+    touched = set()
+    with transaction.atomic():
+        deltas = {}
+        for name, source, column, counter in ROLLUPS:
+            mark = _watermark(name)
+            if mark.value >= upper:
+                continue
+            rows = (
+                source().filter(**{f'{column}__gt': mark.value, f'{column}__lte': upper})
+                .annotate(day=TruncDate(column))
+                .values('event_id', 'day')
+                .annotate(total=Count('id'))
+                .order_by()
+            )
+            for row in rows:
+                key = (row['event_id'], row['day'])
+                deltas.setdefault(key, {})
+                deltas[key][counter] = deltas[key].get(counter, 0) + row['total']
+            mark.value = upper
+            mark.save(update_fields=['value'])
+        _apply(deltas)
+        touched.update(deltas)
+    return len(touched)
+
+
+def daily_trend(events=None, days=30):
+    """Per-day totals over `events` (all when None) for the last `days` days, read from the rollup table only."""
+    since = timezone.localdate() - timedelta(days=days - 1)
+    stats = EventDailyStats.objects.filter(day__gte=since)
+    if events is not None:
+        stats = stats.filter(event__in=events)
+    rows = (
+        stats.values('day')
+        .annotate(created=Sum('created'), confirmed=Sum('confirmed'), cancelled=Sum('cancelled'))
+        .order_by('day')
+    )
+    # days without activity have no rows, show them as zeros
+    by_day = {row['day']: row for row in rows}
+    if not by_day:
+        return []
+    trend = [
+        by_day.get(day) or {'day': day, 'created': 0, 'confirmed': 0, 'cancelled': 0}
+        for day in (since + timedelta(days=offset) for offset in range(days))
+    ]
+    peak = max((row['created'] for row in trend), default=0) or 1
+    for row in trend:
+        row['height'] = round(row['created'] * 100 / peak)
+        row['conversion'] = round(row['confirmed'] * 100 / row['created']) if row['created'] else 0
+    return trend
@@ -1,28 +1,104 @@
-# from django.db.models.signals import m2m_changed, post_delete
-# from django.dispatch import receiver
-# from django.core.mail import send_mail
-# from events.models import Category, Event, RSVP
-
-
-# @receiver(m2m_changed, sender=Event.event.through)
-# def notify_organizer_on_event_creation(sender, instance, action, **kwargs):
-#     print(instance, instance.user.all())
-    
-#     assigned_emails = [user.email for user in instance.event.all()]
-#     print('Checking...', assigned_emails)
-    
-#     send_mail(
-#         "New Task Assigned",
-#         f"You have been assigned to the this task : --> {instance.title}",
-#         "aestheticjersey.aj@gmail.com",
-#         assigned_emails,
-#         fail_silently=False,
-#     )
-    
-# @receiver(post_delete, sender=Event)
-# def  delete_associate_details(sender, instance, **kwargs):
-#     if instance.rsvps:
-#         print(isinstance)
-#         instance.rsvps.delete()
-        
-#         print('Deleted Successfully!')
\ No newline at end of file
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from events.models import Category, Event, RSVP, RSVPActivity
+from events import activity
+from events.live import broadcaster
+from events.facets import invalidate_facets
+from events.categories import invalidate_category_choices
+from events.typeahead import CATEGORY, EVENT, invalidate_typeahead, typeahead
+from events.static_pages import LOCATION_PAGES, event_page, mark_dirty, mark_events_dirty
+
+
+@receiver(post_save, sender=Event)
+@receiver(post_delete, sender=Event)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def refresh_facet_counts(sender, instance, **kwargs):
+    invalidate_facets()
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def refresh_category_choices(sender, instance, **kwargs):
+    invalidate_category_choices()
+
+
+@receiver(post_save, sender=Event)
+@receiver(post_save, sender=Category)
+def index_name(sender, instance, **kwargs):
+    kind = CATEGORY if sender is Category else EVENT
+    if getattr(instance, 'deleted_at', None):
+        # soft_delete() hides the occurrences with update(), which sends no signals
+        transaction.on_commit(invalidate_typeahead)
+        return
+    id, name = instance.id, instance.name
+    transaction.on_commit(lambda: typeahead.update(kind, id, name))
+
+
+@receiver(post_delete, sender=Event)
+@receiver(post_delete, sender=Category)
+def unindex_name(sender, instance, **kwargs):
+    kind = CATEGORY if sender is Category else EVENT
+    id = instance.id
+    transaction.on_commit(lambda: typeahead.update(kind, id))
+
+
+@receiver(post_save, sender=Event)
+def queue_event_pages(sender, instance, created, **kwargs):
+    paths = [event_page(instance.id)]
+    if instance.deleted_at:
+        # soft_delete() hides the occurrences with update()
+        paths += [event_page(id) for id in Event.all_objects.filter(parent_id=instance.id).values_list('id', flat=True)]
+    # the per-location counts on every location page only move when an event appears, goes or moves;
+    # any other change touches just the page listing the event, which export_dirty adds
+    if created or instance.deleted_at or instance.location != getattr(instance, '_saved_location', None):
+        paths += list(LOCATION_PAGES)
+    instance._saved_location = instance.location
+    mark_dirty(paths)
+
+
+@receiver(post_delete, sender=Event)
+def queue_deleted_event_pages(sender, instance, **kwargs):
+    mark_events_dirty([instance.id])
+
+
+@receiver(post_save, sender=Category)
+def queue_category_pages(sender, instance, **kwargs):
+    event_ids = Event.objects.filter(category=instance).values_list('id', flat=True)
+    mark_events_dirty(list(event_ids))
+
+
+@receiver(post_save, sender=RSVP)
+@receiver(post_delete, sender=RSVP)
+def queue_rsvp_pages(sender, instance, **kwargs):
+    # participant counts are on the event page and its location's listing
+    mark_dirty([event_page(instance.event_id)])
+
+
+@receiver(post_save, sender=RSVP)
+@receiver(post_delete, sender=RSVP)
+def push_live_count(sender, instance, **kwargs):
+    event_id = instance.event_id
+    transaction.on_commit(lambda: broadcaster.notify_changed(event_id))
+
+
+@receiver(post_save, sender=RSVP)
+def log_rsvp_saved(sender, instance, created, **kwargs):
+    fields = dict(event_id=instance.event_id, user_id=instance.user_id, rsvp_id=instance.id)
+    if created:
+        activity.record(RSVPActivity.CREATED, **fields)
+    if instance.is_confirmed and not getattr(instance, '_was_confirmed', False):
+        activity.record(RSVPActivity.CONFIRMED, **fields)
+    instance._was_confirmed = instance.is_confirmed
+
+
+@receiver(post_delete, sender=RSVP)
+def log_rsvp_deleted(sender, instance, **kwargs):
+    activity.record(RSVPActivity.DELETED, event_id=instance.event_id, user_id=instance.user_id, rsvp_id=instance.id)
+
+
+@receiver(post_save, sender=Event)
+def log_event_cancelled(sender, instance, update_fields=None, **kwargs):
+    if instance.deleted_at and update_fields and 'deleted_at' in update_fields:
+        activity.record(RSVPActivity.EVENT_CANCELLED, event_id=instance.id)
@@ -0,0 +1,162 @@
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.http import Http404
+from django.test import RequestFactory
+from django.urls import reverse
+from django.utils import timezone
+from core import writebuffer
+from events.models import DirtyPage, Event
+
+
+MANIFEST_NAME = 'manifest.json'
+EXPORT_BATCH_SIZE = 200
+
+
+def event_page(event_id):
+    return f"event/{event_id}/"
+
+
+def location_page(code):
+    return f"location/{code.lower()}/"
+
+
+LOCATION_PAGES = {location_page(code): code for code, _ in Event.LOCATION_CHOICES}
+
+
+def mark_dirty(paths):
+    """
+    Queue pages for the next export_pages run, once the current transaction
+    commits. An event page also stands for the location page listing the
+    event, export_dirty adds that one.
+    """
+    # marking a queued page again moves its marked_at, so a run already rendering it keeps the row
+    writebuffer.queue(
+        [DirtyPage(path=path) for path in set(paths)],
+        update_conflicts=True, unique_fields=('path',), update_fields=('marked_at',),
+    )
+
+
+def mark_events_dirty(event_ids):
+    # the location dropdown counts events per location on every location page
+    mark_dirty([event_page(event_id) for event_id in event_ids] + list(LOCATION_PAGES))
+
+
+def with_location_pages(paths):
+    """`paths` plus the location pages listing the events among them, read with one query."""
+    event_ids = [int(path.split('/')[1]) for path in paths if path not in LOCATION_PAGES]
+    locations = Event.all_objects.filter(id__in=event_ids).values_list('location', flat=True).distinct()
+    return list(dict.fromkeys(list(paths) + [location_page(code) for code in locations]))
+
+
+def render_page(path):
+    """The anonymous HTML of a page, or None when the page should not exist (any more)."""
+    from events.views import details, home
+    factory = RequestFactory()
+    if path in LOCATION_PAGES:
+        request = factory.get(reverse('home'), {'location': LOCATION_PAGES[path]})
+        view, kwargs = home, {}
+    else:
+        kind, event_id, _ = path.split('/')
+        # a recurring series shows its next occurrence, which moves every day
+        if kind != 'event' or not Event.objects.filter(id=event_id, recurrence="NONE").exists():
+            return None
+        request = factory.get(reverse('details', args=[event_id]))
+        view, kwargs = details, {'id': int(event_id)}
+    request.user = AnonymousUser()
+    try:
+        response = view(request, **kwargs)
+    except Http404:
+        return None
+    return response.content if response.status_code == 200 else None
+
+
+class PageWriter:
+    """
+    Writes pages as <root>/<path>/index.html and keeps <root>/manifest.json,
+    {path: sha256 of the content}. A page whose hash did not change is not
+    touched, so its mtime (and the CDN's copy) stays valid. Meant for one
+    export_pages process at a time.
+    """
+
+    def __init__(self, root=None):
+        self.root = Path(root or settings.STATIC_PAGES_ROOT)
+        self.root.mkdir(parents=True, exist_ok=True)
+        try:
+            self.manifest = json.loads((self.root / MANIFEST_NAME).read_text())
+        except FileNotFoundError:
+            self.manifest = {}
+        self.written = self.unchanged = self.removed = 0
+
+    def _replace(self, target, content):
+        # write next to the target and rename, readers never see a half-written page
+        target.parent.mkdir(parents=True, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=target.parent, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as temp:
+            temp.write(content)
+        os.chmod(temp_path, 0o644)
+        os.replace(temp_path, target)
+
+    def export(self, paths):
+        for path in paths:
+            content = render_page(path)
+            target = self.root / path / 'index.html'
+            if content is None:
+                if self.manifest.pop(path, None) is not None:
+                    target.unlink(missing_ok=True)
+                    self.removed += 1
+                continue
+            digest = hashlib.sha256(content).hexdigest()
+            if self.manifest.get(path) == digest and target.exists():
+                self.unchanged += 1
+                continue
+            self._replace(target, content)
+            self.manifest[path] = digest
+            self.written += 1
+
+    def save(self):
+        self._replace(self.root / MANIFEST_NAME, json.dumps(self.manifest, indent=0, sort_keys=True).encode())
+
+
+def export_all(root=None):
+    """Render every page, drop the ones that no longer exist and empty the queue."""
+    started = timezone.now()
+    writer = PageWriter(root)
+    paths = list(LOCATION_PAGES) + [
+        event_page(event_id)
+        for event_id in Event.objects.filter(recurrence="NONE").values_list('id', flat=True).iterator()
+    ]
+    current = set(paths)
+    paths += [path for path in writer.manifest if path not in current]
+    writer.export(paths)
+    writer.save()
+    # only once the pages are on disk; anything marked since we started is left for the next run
+    DirtyPage.objects.filter(marked_at__lte=started).delete()
+    return writer
+
+
+def export_dirty(root=None, batch_size=EXPORT_BATCH_SIZE):
+    """
+    Regenerate only the pages queued before the run started, `batch_size` at
+    a time. A row is deleted after its page is written, so a crash leaves it
+    queued; a page marked again while it renders keeps its row.
+    """
+    started = timezone.now()
+    writer = PageWriter(root)
+    queued = DirtyPage.objects.filter(marked_at__lte=started)
+    exported = set()
+    while True:
+        paths = list(queued.order_by('marked_at', 'path').values_list('path', flat=True)[:batch_size])
+        if not paths:
+            break
+        # a location page shared by several batches is rendered once per run
+        pages = [path for path in with_location_pages(paths) if path not in exported]
+        writer.export(pages)
+        writer.save()
+        exported.update(pages)
+        queued.filter(path__in=paths).delete()
+    return writer
@@ -1,3 +1,251 @@
-from django.test import TestCase
+import asyncio
+import uuid
+from asgiref.sync import async_to_sync
+from datetime import timedelta
+from django.contrib.auth.models import User
+from django.db import connection, transaction
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from core import writebuffer
+from events import activity
+from events.categories import merge_duplicates
+from events.checkin import ADMITTED, ALREADY_CHECKED_IN, INVALID, CheckInDesk
+from events.live import CountBroadcaster, broadcaster
+from events.models import Category, DirtyPage, Event, RSVP, RSVPActivity
+from events.static_pages import LOCATION_PAGES, event_page
+from events.typeahead import EVENT, TypeaheadIndex
+from users.roles import clear_group_ids
 
-# Create your tests here.
+
+@override_settings(CACHES={
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'live-count-tests'},
+})
+class LiveCountBroadcastTests(TestCase):
+    def setUp(self):
+        caches['default'].clear()
+        category = Category.objects.create(name='Tech', description='')
+        self.event = Event.objects.create(
+            name='Launch', description='Launch day', starts_at=timezone.now(), category=category
+        )
+        self.user = User.objects.create_user('fan', 'fan@example.com', 'pw')
+        self.loop = asyncio.new_event_loop()
+        self.addCleanup(self.loop.close)
+
+    def subscribe(self, count):
+        queues = [broadcaster.subscribe(self.event.id, loop=self.loop) for _ in range(count)]
+        for queue in queues:
+            self.addCleanup(broadcaster.unsubscribe, self.event.id, queue)
+        return queues
+
+    def reads_while_running(self, callbacks):
+        # commit callbacks also flush the RSVP activity log; only reads matter here
+        with CaptureQueriesContext(connection) as queries:
+            for callback in callbacks:
+                callback()
+        return sum(query['sql'].startswith('SELECT') for query in queries.captured_queries)
+
+    def reads_while_polling(self):
+        with CaptureQueriesContext(connection) as queries:
+            async_to_sync(broadcaster.poll)()
+        # run the call_soon_threadsafe deliveries
+        self.loop.run_until_complete(asyncio.sleep(0))
+        return len(queries.captured_queries)
+
+    def confirm_rsvp(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            RSVP.objects.create(user=self.user, event=self.event, is_confirmed=True)
+        # the commit only bumps the shared version, whoever is listening
+        self.assertEqual(self.reads_while_running(callbacks), 0)
+
+    def test_one_read_per_change_for_one_subscriber(self):
+        queues = self.subscribe(1)
+        self.confirm_rsvp()
+        self.assertEqual(self.reads_while_polling(), 1)
+        self.assertEqual(queues[0].get_nowait(), 1)
+
+    def test_one_read_per_change_for_many_subscribers(self):
+        queues = self.subscribe(200)
+        self.confirm_rsvp()
+        self.assertEqual(self.reads_while_polling(), 1)
+        self.assertEqual([queue.get_nowait() for queue in queues], [1] * 200)
+
+    def test_no_read_without_a_change(self):
+        self.subscribe(1)
+        self.confirm_rsvp()
+        self.reads_while_polling()
+        self.assertEqual(self.reads_while_polling(), 0)
+
+    def test_change_from_another_worker_is_delivered(self):
+        queues = self.subscribe(1)
+        RSVP.objects.create(user=self.user, event=self.event, is_confirmed=True)
+        # what the commit callback of another process does: only the shared cache connects them
+        CountBroadcaster().notify_changed(self.event.id)
+        self.reads_while_polling()
+        self.assertEqual(queues[0].get_nowait(), 1)
+
+    def test_slow_subscriber_only_keeps_latest_count(self):
+        local = CountBroadcaster()
+        queue = local.subscribe(self.event.id, loop=self.loop)
+        for count in (1, 2, 3):
+            local.publish(self.event.id, count)
+        self.loop.run_until_complete(asyncio.sleep(0))
+        self.assertEqual(queue.qsize(), 1)
+        self.assertEqual(queue.get_nowait(), 3)
+
+    def test_closed_loop_is_pruned(self):
+        loop = asyncio.new_event_loop()
+        broadcaster.subscribe(self.event.id, loop=loop)
+        loop.close()
+        broadcaster.notify_changed(self.event.id)
+        async_to_sync(broadcaster.poll)()
+        self.assertEqual(broadcaster.subscriber_count(self.event.id), 0)
+
+    def test_no_stream_under_wsgi(self):
+        response = self.client.get(f'/event/{self.event.id}/live/')
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(broadcaster.subscriber_count(self.event.id), 0)
+        self.assertNotContains(self.client.get(f'/event/{self.event.id}/'), 'EventSource')
+
+    def test_stream_of_missing_event_is_404(self):
+        self.assertEqual(self.client.get(f'/event/{self.event.id + 1}/live/').status_code, 404)
+
+
+@override_settings(CACHES={
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'typeahead-tests'},
+})
+class TypeaheadIndexTests(TestCase):
+    def setUp(self):
+        caches['default'].clear()
+        self.category = Category.objects.create(name='Café Concerts', description='')
+        Event.objects.create(name='Summer Jazz Night', description='', starts_at=timezone.now(), category=self.category)
+
+    def labels(self, index, query):
+        return [item['label'] for item in index.suggest(query)]
+
+    def test_word_prefixes_without_queries(self):
+        index = TypeaheadIndex()
+        index.build()
+        with self.assertNumQueries(0):
+            self.assertEqual(self.labels(index, 'JAZZ n'), ['Summer Jazz Night'])
+            self.assertEqual(self.labels(index, 'cafe'), ['Café Concerts'])
+            self.assertEqual(self.labels(index, 'x'), [])
+
+    def test_changes_reach_other_workers(self):
+        mine, other = TypeaheadIndex(), TypeaheadIndex()
+        mine.build()
+        other.build()
+        event = Event.objects.create(
+            name='Jazz Brunch', description='', starts_at=timezone.now(), category=self.category
+        )
+        # what the post_save commit callback does in the saving worker
+        mine.update(EVENT, event.id, event.name)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.labels(mine, 'jazz'), ['Jazz Brunch', 'Summer Jazz Night'])
+        with self.assertNumQueries(1):
+            self.assertEqual(self.labels(other, 'jazz'), ['Jazz Brunch', 'Summer Jazz Night'])
+
+
+class CheckInDeskTests(TestCase):
+    def setUp(self):
+        self.organizer = User.objects.create_user('host', 'host@example.com', 'pw')
+        self.event = Event.objects.create(
+            name='Gala', description='', starts_at=timezone.now(), organizer=self.organizer,
+            category=Category.objects.create(name='Party', description=''),
+        )
+        guest = User.objects.create_user('guest', 'guest@example.com', 'pw')
+        self.rsvp = RSVP.objects.create(user=guest, event=self.event, is_confirmed=True)
+
+    def test_admission_is_written_before_the_answer(self):
+        self.assertEqual(CheckInDesk().verify(self.event.id, self.rsvp.token), (ADMITTED, 'guest'))
+        self.rsvp.refresh_from_db()
+        self.assertIsNotNone(self.rsvp.checked_in_at)
+
+    def test_two_workers_admit_a_token_once(self):
+        first, second = CheckInDesk(), CheckInDesk()
+        first.roster(self.event.id)
+        second.roster(self.event.id)
+        self.assertEqual(first.verify(self.event.id, self.rsvp.token)[0], ADMITTED)
+        # the second worker's roster still thinks the guest is outside
+        self.assertEqual(second.verify(self.event.id, self.rsvp.token)[0], ALREADY_CHECKED_IN)
+        self.assertEqual(second.verify(self.event.id, uuid.uuid4())[0], INVALID)
+
+    def test_sync_rejects_a_non_list_payload(self):
+        self.client.force_login(self.organizer)
+        response = self.client.post(
+            f'/event/{self.event.id}/check-in/sync/', {'checkins': 5}, content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 400)
+
+
+class EndedSeriesTests(TestCase):
+    def test_ended_series_takes_no_rsvp(self):
+        started = timezone.now() - timedelta(days=30)
+        series = Event.objects.create(
+            name='Book club', description='', starts_at=started, recurrence="WEEKLY",
+            recurrence_until=(started + timedelta(days=14)).date(),
+            category=Category.objects.create(name='Books', description=''),
+        )
+        self.client.force_login(User.objects.create_user('reader', 'reader@example.com', 'pw'))
+        response = self.client.get(reverse('details', args=[series.id]))
+        self.assertFalse(response.context['show_rsvp_button'])
+        self.client.post(reverse('details', args=[series.id]), {'action': 'rsvp'})
+        self.assertFalse(RSVP.all_objects.exists())
+
+
+class ActivityLogTests(TestCase):
+    def test_request_entries_are_written_with_one_insert(self):
+        # the executed commit callbacks also remember the default group's id, which the test rollback removes
+        self.addCleanup(clear_group_ids)
+        event = Event.objects.create(
+            name='Gala', description='', starts_at=timezone.now(),
+            category=Category.objects.create(name='Party', description=''),
+        )
+        with CaptureQueriesContext(connection) as queries, writebuffer.buffered():
+            with self.captureOnCommitCallbacks(execute=True):
+                for name in ('ann', 'bob'):
+                    RSVP.objects.create(user=User.objects.create_user(name), event=event)
+                try:
+                    with transaction.atomic():
+                        activity.record(RSVPActivity.EVENT_CANCELLED, event_id=event.id)
+                        raise ValueError
+                except ValueError:
+                    pass
+        inserts = [query for query in queries.captured_queries if 'INSERT INTO "events_rsvpactivity"' in query['sql']]
+        self.assertEqual(len(inserts), 1)
+        self.assertEqual(list(RSVPActivity.objects.values_list('action', flat=True)), [RSVPActivity.CREATED] * 2)
+
+    def test_impossible_date_filter_is_ignored(self):
+        self.client.force_login(User.objects.create_superuser('boss', 'boss@example.com', 'pw'))
+        response = self.client.get(reverse('api-rsvp-activity'), {'since': '2026-13-45', 'until': '2026-02-30T25:00'})
+        self.assertEqual(response.status_code, 200)
+
+
+class DirtyPageTests(TestCase):
+    def test_only_a_move_queues_every_location_page(self):
+        event = Event.objects.create(
+            name='Gala', description='', starts_at=timezone.now(),
+            category=Category.objects.create(name='Party', description=''),
+        )
+        event = Event.objects.get(id=event.id)
+        with self.captureOnCommitCallbacks(execute=True):
+            event.name = 'Grand Gala'
+            event.save()
+        self.assertEqual(list(DirtyPage.objects.values_list('path', flat=True)), [event_page(event.id)])
+        with self.captureOnCommitCallbacks(execute=True):
+            event.location = Event.LOCATION_CHOICES[-1][0]
+            event.save()
+        self.assertEqual(DirtyPage.objects.count(), len(LOCATION_PAGES) + 1)
+
+
+class MergeCategoriesTests(TestCase):
+    def test_names_differing_by_case_and_spaces_are_merged(self):
+        music = Category.objects.create(name='Music ', description='')
+        duplicate = Category.objects.create(name='music', description='')
+        event = Event.objects.create(name='Gig', description='', starts_at=timezone.now(), category=duplicate)
+        self.assertEqual(merge_duplicates(), (1, 1, 1))
+        self.assertEqual(list(Category.objects.values_list('name', flat=True)), ['Music'])
+        event.refresh_from_db()
+        self.assertEqual(event.category_id, music.id)
@@ -0,0 +1,124 @@
+import bisect
+import threading
+import unicodedata
+from django.db.models import CharField, Value
+from core.cache import tiered_cache
+from events.models import Category, Event
+
+
+TYPEAHEAD_NAMESPACE = 'typeahead'
+SUGGESTION_LIMIT = 10
+
+EVENT = 'event'
+CATEGORY = 'category'
+
+
+def normalize(text):
+    """Case- and accent-insensitive form with single spaces: "  Café  NIGHT" -> "cafe night"."""
+    decomposed = unicodedata.normalize('NFKD', text or '')
+    stripped = ''.join(char for char in decomposed if not unicodedata.combining(char))
+    return ' '.join(stripped.casefold().split())
+
+
+def index_keys(name):
+    # the name from every word on, so "jazz" also finds "Summer Jazz Night"
+    words = normalize(name).split()
+    return [' '.join(words[i:]) for i in range(len(words))]
+
+
+def invalidate_typeahead():
+    # for bulk changes that skip signals, every worker rebuilds on its next lookup
+    tiered_cache.bump(TYPEAHEAD_NAMESPACE)
+
+
+class TypeaheadIndex:
+    """
+    Event and category names of this process in a sorted list of
+    (key, kind, id), searched by prefix with bisect, so a keystroke costs
+    no query.
+
+    It is built with one UNION query on first use (or by the warm-up) and
+    kept current by the Event/Category signals of this worker. Every change
+    bumps a shared version; a worker that sees a version it did not produce
+    itself rebuilds, which is how changes made elsewhere reach it.
+    """
+
+    def __init__(self):
+        self._keys = []
+        self._labels = {}
+        self._version = None
+        self._lock = threading.Lock()
+
+    def _add(self, kind, id, name):
+        self._labels[(kind, id)] = name
+        for key in index_keys(name):
+            bisect.insort(self._keys, (key, kind, id))
+
+    def _remove(self, kind, id):
+        name = self._labels.pop((kind, id), None)
+        if name is None:
+            return
+        for key in index_keys(name):
+            i = bisect.bisect_left(self._keys, (key, kind, id))
+            if i < len(self._keys) and self._keys[i] == (key, kind, id):
+                del self._keys[i]
+
+    def build(self):
+        # read the version first, a change committed during the query triggers another build
+        version = tiered_cache.version(TYPEAHEAD_NAMESPACE)
+        rows = Event.objects.annotate(kind=Value(EVENT, output_field=CharField())).values_list(
+            'kind', 'id', 'name'
+        ).union(
+            Category.objects.annotate(kind=Value(CATEGORY, output_field=CharField())).values_list('kind', 'id', 'name'),
+            all=True,
+        )
+        labels = {(kind, id): name for kind, id, name in rows}
+        keys = sorted(
+            (key, kind, id) for (kind, id), name in labels.items() for key in index_keys(name)
+        )
+        with self._lock:
+            self._keys, self._labels, self._version = keys, labels, version
+
+    def ensure_current(self):
+        # the version is held in the local cache tier for a few seconds, so this is usually free
+        if self._version != tiered_cache.version(TYPEAHEAD_NAMESPACE):
+            self.build()
+
+    def suggest(self, query, limit=SUGGESTION_LIMIT):
+        """Up to `limit` {'type', 'id', 'label'} dicts whose name has a word starting with `query`."""
+        prefix = normalize(query)
+        if not prefix:
+            return []
+        self.ensure_current()
+        suggestions, seen = [], set()
+        with self._lock:
+            i = bisect.bisect_left(self._keys, (prefix,))
+            while i < len(self._keys) and len(suggestions) < limit:
+                key, kind, id = self._keys[i]
+                if not key.startswith(prefix):
+                    break
+                label = self._labels[(kind, id)]
+                # occurrences of a recurring series share their name
+                if (kind, label) not in seen:
+                    seen.add((kind, label))
+                    suggestions.append({'type': kind, 'id': id, 'label': label})
+                i += 1
+        return suggestions
+
+    def update(self, kind, id, name=None):
+        """Apply one committed change (name=None removes the entry) and announce it to the other workers."""
+        with self._lock:
+            if self._version is not None and self._labels.get((kind, id)) == name:
+                return
+            known = self._version
+            if known is not None:
+                self._remove(kind, id)
+                if name is not None:
+                    self._add(kind, id, name)
+        version = tiered_cache.bump(TYPEAHEAD_NAMESPACE)
+        with self._lock:
+            # a gap in the versions means another worker changed something too: rebuild next time
+            self._version = version if known is not None and version == known + 1 else None
+
+
+typeahead = TypeaheadIndex()
@@ -0,0 +1,178 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+import uuid
+from pathlib import Path
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+from django.utils.text import get_valid_filename
+from PIL import Image
+
+
+IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.gif', '.webp'}
+IMAGE_FORMATS = {'JPEG', 'PNG', 'GIF', 'WEBP'}
+MAX_IMAGE_PIXELS = 50_000_000
+COPY_BUFFER = 64 * 1024
+
+
+class UploadError(Exception):
+    def __init__(self, message, status=400, offset=None):
+        super().__init__(message)
+        self.status = status
+        self.offset = offset
+
+
+def upload_dir():
+    path = Path(settings.FILE_UPLOAD_TEMP_DIR or tempfile.gettempdir()) / 'event-uploads'
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+class ChunkedUpload:
+    """
+    One resumable upload: `<id>.part` grows on disk as chunks arrive and
+    `<id>.json` holds what the client announced (name, size, sha256, owner).
+    The resume offset is simply the size of the part file.
+    """
+
+    def __init__(self, upload_id):
+        try:
+            self.id = uuid.UUID(str(upload_id)).hex
+        except ValueError:
+            raise UploadError("Unknown upload.", status=404)
+        self.part_path = upload_dir() / f"{self.id}.part"
+        self.meta_path = upload_dir() / f"{self.id}.json"
+        self._meta = None
+
+    @classmethod
+    def start(cls, user, filename, size, sha256):
+        extension = os.path.splitext(filename or '')[1].lower()
+        if extension not in IMAGE_EXTENSIONS:
+            raise UploadError(f"Only {', '.join(sorted(IMAGE_EXTENSIONS))} images can be uploaded.")
+        if not isinstance(size, int) or not 0 < size <= settings.CHUNKED_UPLOAD_MAX_SIZE:
+            raise UploadError(f"Size must be between 1 and {settings.CHUNKED_UPLOAD_MAX_SIZE} bytes.")
+        if not isinstance(sha256, str) or len(sha256) != 64:
+            raise UploadError("sha256 must be a hex digest.")
+        cleanup_stale_uploads()
+
+        upload = cls(uuid.uuid4())
+        upload.part_path.touch()
+        upload.meta_path.write_text(json.dumps({
+            'user_id': user.id,
+            'filename': get_valid_filename(os.path.basename(filename)),
+            'size': size,
+            'sha256': sha256.lower(),
+        }))
+        return upload
+
+    @property
+    def meta(self):
+        if self._meta is None:
+            try:
+                self._meta = json.loads(self.meta_path.read_text())
+            except FileNotFoundError:
+                raise UploadError("Unknown upload.", status=404)
+        return self._meta
+
+    @property
+    def offset(self):
+        return self.part_path.stat().st_size if self.part_path.exists() else 0
+
+    def check_owner(self, user):
+        if self.meta['user_id'] != user.id:
+            raise UploadError("Unknown upload.", status=404)
+
+    def append(self, stream, offset, length):
+        """
+        Copy `length` bytes from `stream` onto the part file, in COPY_BUFFER pieces,
+        so a chunk never sits in memory. `offset` must equal what is already stored.
+        """
+        current = self.offset
+        if offset != current:
+            raise UploadError("Offset does not match the stored size.", status=409, offset=current)
+        if length > settings.CHUNKED_UPLOAD_CHUNK_SIZE:
+            raise UploadError(f"Chunks are limited to {settings.CHUNKED_UPLOAD_CHUNK_SIZE} bytes.", status=413)
+        if current + length > self.meta['size']:
+            raise UploadError("Chunk goes past the announced size.", status=413, offset=current)
+
+        written = 0
+        with open(self.part_path, 'ab') as part:
+            while written < length:
+                piece = stream.read(min(COPY_BUFFER, length - written))
+                if not piece:
+                    break
+                part.write(piece)
+                written += len(piece)
+        return current + written
+
+    def verify(self):
+        if self.offset != self.meta['size']:
+            raise UploadError("Upload is not complete yet.", status=409, offset=self.offset)
+        digest = hashlib.sha256()
+        with open(self.part_path, 'rb') as part:
+            for piece in iter(lambda: part.read(COPY_BUFFER), b''):
+                digest.update(piece)
+        if digest.hexdigest() != self.meta['sha256']:
+            self.discard()
+            raise UploadError("Checksum mismatch, the upload has to be restarted.", status=422)
+        self.check_image()
+
+    def check_image(self):
+        """What ImageField validation would do for a form upload: Pillow must recognise the file."""
+        try:
+            with Image.open(self.part_path) as image:
+                image_format, (width, height) = image.format, image.size
+                image.verify()
+        except (OSError, SyntaxError, ValueError, Image.DecompressionBombError):
+            image_format = None
+        if image_format not in IMAGE_FORMATS or width * height > MAX_IMAGE_PIXELS:
+            self.discard()
+            raise UploadError(
+                f"Not a usable image, upload a {', '.join(sorted(IMAGE_FORMATS))} file "
+                f"of at most {MAX_IMAGE_PIXELS} pixels.", status=422
+            )
+
+    def attach(self, event):
+        """
+        Move the verified file into storage as `event.image`. With local storage
+        it is a rename inside the filesystem; other storages stream it in chunks.
+        """
+        self.verify()
+        field = event._meta.get_field('image')
+        name = field.generate_filename(event, self.meta['filename'])
+        storage = field.storage
+        if isinstance(storage, FileSystemStorage):
+            name = storage.get_available_name(name)
+            target = Path(storage.path(name))
+            target.parent.mkdir(parents=True, exist_ok=True)
+            shutil.move(self.part_path, target)
+            if storage.file_permissions_mode is not None:
+                os.chmod(target, storage.file_permissions_mode)
+        else:
+            with open(self.part_path, 'rb') as part:
+                name = storage.save(name, File(part))
+        event.image.name = name
+        event.save(update_fields=['image'])
+        self.discard()
+        return name
+
+    def discard(self):
+        self.part_path.unlink(missing_ok=True)
+        self.meta_path.unlink(missing_ok=True)
+
+
+def cleanup_stale_uploads(max_age=None):
+    """Drop uploads that saw no chunk for CHUNKED_UPLOAD_EXPIRY seconds."""
+    max_age = max_age or settings.CHUNKED_UPLOAD_EXPIRY
+    cutoff = time.time() - max_age
+    removed = 0
+    for path in upload_dir().glob('*.part'):
+        if path.stat().st_mtime < cutoff:
+            path.unlink(missing_ok=True)
+            path.with_suffix('.json').unlink(missing_ok=True)
+            removed += 1
+    return removed
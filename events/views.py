@@ -1,12 +1,33 @@
 from django.shortcuts import render, redirect, get_object_or_404
+from django.core.handlers.asgi import ASGIRequest
+from django.http import Http404, HttpResponse, JsonResponse, StreamingHttpResponse
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
+from django.views.decorators.http import require_http_methods, require_POST
 from django.core.mail import send_mail
-from django.db.models import Count, Q
+from django.db.models import Sum
 from django.conf import settings
-from datetime import date
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from datetime import date, timedelta
+import asyncio
+import copy
+import json
 from events.form import EventForm
-from events.models import Event, Category, RSVP
+from events.models import ArchivedEvent, ArchivedRSVP, Event, EventSimilarity, RSVP, count_rsvps
+from events.categories import get_or_create_category
+from events.archive import (
+    archived_event_count, parse_past_cursor, past_events_page, past_page_query, rsvp_history_page
+)
+from events.checkin import INVALID, desk, parse_token
+from events.facets import facet_counts, facet_rows
+from events.uploads import ChunkedUpload, UploadError
+from events.live import broadcaster
+from events.rollups import daily_trend
+from events.recurrence import (
+    DEFAULT_WINDOW_DAYS, day_start, events_in_window, is_occurrence, materialize_occurrence, next_occurrence,
+    parse_window, starts_between, window_q
+)
 
 
 def is_organizer(user):
@@ -16,17 +37,52 @@ def is_admin(user):
     return user.is_authenticated and (user.groups.filter(name='Admin').exists() or user.is_superuser)
 
 
+def parse_occurrence_date(value):
+    try:
+        return date.fromisoformat(value or '')
+    except ValueError:
+        raise Http404("Invalid occurrence date.")
+
+
+def get_occurrence(series, value):
+    occurrence = materialize_occurrence(series, parse_occurrence_date(value))
+    if occurrence is None:
+        raise Http404("This event does not take place on that date.")
+    return occurrence
+
+
 #HOME 
-def home(request):
-    events = Event.objects.select_related('category').prefetch_related('rsvps')
+RECOMMENDED_COUNT = 4
 
+def home(request):
     search_query = request.GET.get('search', '')
+    location = request.GET.get('location', '')
+    try:
+        category_id = int(request.GET.get('category') or 0) or None
+    except ValueError:
+        category_id = None
+
+    # recurring events are expanded for the requested window only
+    start, end = parse_window(request.GET)
+    has_window = bool(request.GET.get('start') or request.GET.get('end'))
+
+    filtered = Event.objects.all()
     if search_query:
-        events = events.filter(name__icontains=search_query)
+        filtered = filtered.filter(name__icontains=search_query)
+    if has_window:
+        filtered = filtered.filter(window_q(start, end))
 
-    location = request.GET.get('location', '')
+    # sidebar counts: one grouped query, cached per search/date signature
+    facet_start, facet_end = (start, end) if has_window else (None, None)
+    rows = facet_rows(filtered, search_query, facet_start, facet_end)
+    location_facets, category_facets = facet_counts(rows, location, category_id)
+
+    events = filtered.select_related('category').prefetch_related('rsvps')
     if location:
         events = events.filter(location=location)
+    if category_id:
+        events = events.filter(category_id=category_id)
+    events = events_in_window(events, start, end, one_off=events.filter(recurrence="NONE"))
 
     # RSVP's confirmed
     user_rsvp_event_ids = set()
@@ -35,12 +91,25 @@ def home(request):
             RSVP.objects.filter(user=request.user, is_confirmed=True).values_list('event_id', flat=True)
         )
 
+    # events you may like: precomputed neighbours of what the user RSVP'd to, one query
+    recommended = []
+    if request.user.is_authenticated:
+        rsvp_event_ids = RSVP.objects.filter(user=request.user).values('event_id')
+        recommended = Event.objects.filter(
+            neighbor_of__event_id__in=rsvp_event_ids, starts_at__gte=day_start(timezone.localdate())
+        ).exclude(id__in=rsvp_event_ids).annotate(score=Sum('neighbor_of__score')).order_by('-score')[:RECOMMENDED_COUNT]
+
     context = {
         'events': events,
-        'locations': Event.LOCATION_CHOICES,
+        'locations': location_facets,
+        'categories': category_facets,
         'search_query': search_query,
         'selected_location': location,
+        'selected_category': category_id,
+        'start': facet_start,
+        'end': facet_end,
         'user_rsvp_event_ids': user_rsvp_event_ids,
+        'recommended': recommended,
     }
     return render(request, "home.html", context)
 
@@ -58,6 +127,10 @@ def quick_rsvp(request, event_id):
         messages.info(request, "Organizers and admins cannot RSVP for events.")
         return redirect('home')
 
+    # first RSVP to an occurrence of a recurring event creates its row
+    if event.is_recurring:
+        event = get_occurrence(event, request.GET.get('date'))
+
     existing = RSVP.objects.filter(user=request.user, event=event).first()
     if existing:
         if existing.is_confirmed:
@@ -91,6 +164,7 @@ def confirm_rsvp(request, token):
     rsvp = get_object_or_404(RSVP, token=token)
     if not rsvp.is_confirmed:
         rsvp.is_confirmed = True
+        rsvp.confirmed_at = timezone.now()
         rsvp.save()
         messages.success(request, f"Your RSVP for '{rsvp.event.name}' is confirmed!")
     else:
@@ -105,6 +179,24 @@ def details(request, id):
         id=id
     )
 
+    # recurring event: show one occurrence, the requested one or the next upcoming
+    series = None
+    if event.is_recurring:
+        value = request.POST.get('date') or request.GET.get('date')
+        day = parse_occurrence_date(value) if value else next_occurrence(event)
+        if day is not None:
+            if not is_occurrence(event, day):
+                raise Http404("This event does not take place on that date.")
+            occurrence = event.occurrences.filter(**starts_between(day, day)).first()
+            if occurrence:
+                return redirect('details', id=occurrence.id)
+            series = event
+            event = copy.copy(series)
+            event.date = day
+            event.is_virtual = True
+    # a series with no upcoming date is shown as is, but there is nothing left to RSVP for
+    series_ended = series is None and event.is_recurring
+
     user = request.user
     user_rsvp = None
     user_has_rsvpd = False
@@ -127,7 +219,12 @@ def details(request, id):
         if user_rsvp:
             messages.info(request, "You have already RSVP'd for this event.")
             return redirect('details', id=id)
+        if series_ended:
+            messages.info(request, "This event has no upcoming dates.")
+            return redirect('details', id=id)
 
+        if series is not None:
+            event = get_occurrence(series, event.date.isoformat())
         rsvp = RSVP.objects.create(user=user, event=event, is_confirmed=False)
         confirm_url = f"{settings.FRONTEND_URL}rsvp/confirm/{rsvp.token}/"
         send_mail(
@@ -142,7 +239,7 @@ def details(request, id):
             fail_silently=True,
         )
         messages.success(request, "Confirmation email sent! Please check your inbox.")
-        return redirect('details', id=id)
+        return redirect('details', id=event.id)
 
     # RSVP list
     show_rsvp_list = False
@@ -161,11 +258,23 @@ def details(request, id):
             show_rsvp_list = False
             show_rsvp_button = not user_has_rsvpd
 
-    confirmed_rsvps = event.rsvps.filter(is_confirmed=True).select_related('user')
+    if series_ended:
+        show_rsvp_button = False
+
+    if series is not None:
+        confirmed_rsvps = RSVP.objects.none()
+    else:
+        confirmed_rsvps = event.rsvps.filter(is_confirmed=True).select_related('user')
+
+    similar_events = EventSimilarity.objects.filter(
+        event_id=(series or event).id, similar_event__starts_at__gte=day_start(timezone.localdate()),
+        similar_event__deleted_at__isnull=True
+    ).select_related('similar_event').order_by('-score')[:RECOMMENDED_COUNT]
 
     context = {
         'event': event,
         'confirmed_rsvps': confirmed_rsvps,
+        'similar_events': similar_events,
         'rsvp_count': confirmed_rsvps.count(),
         'user_has_rsvpd': user_has_rsvpd,
         'rsvp_confirmed': rsvp_confirmed,
@@ -173,50 +282,219 @@ def details(request, id):
         'show_rsvp_button': show_rsvp_button,
         'is_admin': is_admin(user) if user.is_authenticated else False,
         'is_organizer': is_organizer(user) if user.is_authenticated else False,
+        'live_updates': live_updates(request),
     }
     return render(request, "details.html", context)
 
 
+#LIVE PARTICIPANT COUNT (Server-Sent Events, needs ASGI)
+LIVE_KEEPALIVE_SECONDS = 20
+
+def live_updates(request):
+    # under WSGI an endless stream would hold a worker thread per visitor
+    return isinstance(request, ASGIRequest)
+
+
+async def event_live_count(request, id):
+    if not await Event.objects.filter(id=id).aexists():
+        raise Http404("Event not found.")
+    if not live_updates(request):
+        # 204 tells EventSource not to reconnect
+        return HttpResponse(status=204)
+    queue = broadcaster.subscribe(id)
+
+    async def stream():
+        try:
+            yield "retry: 5000\n\n"
+            while True:
+                try:
+                    count = await asyncio.wait_for(queue.get(), timeout=LIVE_KEEPALIVE_SECONDS)
+                    yield f"event: count\ndata: {count}\n\n"
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+        finally:
+            broadcaster.unsubscribe(id, queue)
+
+    response = StreamingHttpResponse(stream(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
+#CHECK-IN AT THE DOOR
+def can_check_in(user, roster):
+    # organizers of the event are answered from the roster, no query
+    return user.id == roster.organizer_id or user.is_superuser or is_admin(user)
+
+
+@login_required
+@require_POST
+def check_in(request, id):
+    roster = desk.roster(id)
+    if not roster.found:
+        raise Http404("Event not found.")
+    if not can_check_in(request.user, roster):
+        return JsonResponse({'error': "You can't check in guests for this event."}, status=403)
+    token = parse_token(request.POST.get('token'))
+    if token is None:
+        return JsonResponse({'status': INVALID, 'attendee': None}, status=400)
+    status, attendee = desk.verify(id, token)
+    return JsonResponse({'status': status, 'attendee': attendee})
+
+
+@login_required
+@require_POST
+def check_in_sync(request, id):
+    """Offline scans: {"checkins": [{"token": "...", "scanned_at": "2026-10-19T18:02:11Z"}, ...]}"""
+    roster = desk.roster(id)
+    if not roster.found:
+        raise Http404("Event not found.")
+    if not can_check_in(request.user, roster):
+        return JsonResponse({'error': "You can't check in guests for this event."}, status=403)
+    try:
+        checkins = json.loads(request.body)['checkins']
+    except (ValueError, KeyError, TypeError):
+        checkins = None
+    if not isinstance(checkins, list):
+        return JsonResponse({'error': "Expected a JSON body with a 'checkins' list."}, status=400)
+
+    scans = {}
+    malformed = 0
+    now = timezone.now()
+    for item in checkins:
+        token = parse_token(item.get('token')) if isinstance(item, dict) else None
+        if token is None:
+            malformed += 1
+            continue
+        try:
+            scanned_at = parse_datetime(str(item.get('scanned_at') or '')) or now
+        except ValueError:
+            # well-formed but impossible, e.g. month 13
+            scanned_at = now
+        if timezone.is_naive(scanned_at):
+            scanned_at = timezone.make_aware(scanned_at)
+        # the earliest scan of a token is the admission time
+        scans[token] = min(scans.get(token, scanned_at), scanned_at)
+
+    applied, duplicates, invalid = desk.sync(id, scans)
+    return JsonResponse({'applied': applied, 'duplicates': duplicates, 'invalid': invalid + malformed})
+
+
+#CHUNKED BANNER UPLOADS
+def upload_error(exc):
+    return JsonResponse({'error': str(exc), 'offset': exc.offset}, status=exc.status)
+
+
+@login_required
+@require_POST
+def upload_start(request):
+    if not (is_admin(request.user) or is_organizer(request.user)):
+        return JsonResponse({'error': "You don't have permission to upload images."}, status=403)
+    try:
+        data = json.loads(request.body)
+        upload = ChunkedUpload.start(request.user, data.get('filename'), data.get('size'), data.get('sha256'))
+    except (ValueError, AttributeError):
+        return JsonResponse({'error': "Expected a JSON body with filename, size and sha256."}, status=400)
+    except UploadError as exc:
+        return upload_error(exc)
+    return JsonResponse({'upload_id': upload.id, 'offset': 0, 'chunk_size': settings.CHUNKED_UPLOAD_CHUNK_SIZE}, status=201)
+
+
+@login_required
+@require_http_methods(['GET', 'HEAD', 'PATCH'])
+def upload_chunk(request, upload_id):
+    """GET: current offset to resume from. PATCH: raw chunk body, Upload-Offset header."""
+    try:
+        upload = ChunkedUpload(upload_id)
+        upload.check_owner(request.user)
+        if request.method == 'PATCH':
+            try:
+                offset = int(request.headers['Upload-Offset'])
+                length = int(request.headers['Content-Length'])
+            except (KeyError, ValueError):
+                return JsonResponse({'error': "Upload-Offset and Content-Length headers are required."}, status=400)
+            # read from the request stream, never request.body
+            new_offset = upload.append(request, offset, length)
+        else:
+            new_offset = upload.offset
+    except UploadError as exc:
+        return upload_error(exc)
+    return JsonResponse({'offset': new_offset, 'size': upload.meta['size']})
+
+
+@login_required
+@require_POST
+def upload_complete(request, upload_id):
+    """Verify the checksum; with ?event=<id> the file also becomes that event's image."""
+    try:
+        upload = ChunkedUpload(upload_id)
+        upload.check_owner(request.user)
+        event_id = request.GET.get('event')
+        if not event_id:
+            upload.verify()
+            return JsonResponse({'upload_id': upload.id, 'verified': True})
+        if is_admin(request.user):
+            event = get_object_or_404(Event, id=event_id)
+        else:
+            event = get_object_or_404(Event, id=event_id, organizer=request.user)
+        name = upload.attach(event)
+    except UploadError as exc:
+        return upload_error(exc)
+    return JsonResponse({'upload_id': upload.id, 'verified': True, 'image': event.image.url, 'name': name})
+
+
 #DASHBOARD 
 @login_required
 def dashboard(request):
     user = request.user
-    today = date.today()
+    today = timezone.localdate()
+    today_start = day_start(today)
 
     # Admin dashboard
     if is_admin(user):
         if request.method == 'POST' and request.POST.get('action') == 'delete_event':
             event_id = request.POST.get('event_id')
             event = get_object_or_404(Event, id=event_id)
-            event.delete()
+            event.soft_delete()
             messages.success(request, f"Event deleted successfully!")
             return redirect('dashboard')
 
         filter_type = request.GET.get('filter', 'today')
+        next_page = None
+        base = Event.objects.select_related('category').annotate(rsvp_count=count_rsvps())
+        window_end = today + timedelta(days=DEFAULT_WINDOW_DAYS)
         if filter_type == 'all':
-            events = Event.objects.all()
+            events = base.order_by('-starts_at')
             title = "All Events"
         elif filter_type == 'upcoming':
-            events = Event.objects.filter(date__gte=today)
+            events = events_in_window(base, today, window_end, one_off=base.filter(recurrence="NONE", starts_at__gte=today_start))
+            events.reverse()
             title = "Upcoming Events"
         elif filter_type == 'past':
-            events = Event.objects.filter(date__lt=today)
+            # older events live in the archive tables, read them as part of the same list
+            events, cursor = past_events_page(
+                base.filter(starts_at__lt=today_start),
+                ArchivedEvent.objects.select_related('category').annotate(rsvp_count=count_rsvps()),
+                parse_past_cursor(request.GET),
+            )
+            next_page = past_page_query(cursor, filter='past')
             title = "Past Events"
         else:
-            events = Event.objects.filter(date=today)
+            events = events_in_window(base, today, today)
+            events.reverse()
             title = "Today's Events"
 
-        events = events.select_related('category').annotate(rsvp_count=Count('rsvps')).order_by('-date', '-time')
-
         context = {
             'role': 'admin',
             'total_rsvps': RSVP.objects.filter(is_confirmed=True).count(),
             'total_events': Event.objects.count(),
-            'upcoming_events_count': Event.objects.filter(date__gte=today).count(),
-            'past_events_count': Event.objects.filter(date__lt=today).count(),
+            'upcoming_events_count': Event.objects.filter(starts_at__gte=today_start).count(),
+            'past_events_count': Event.objects.filter(starts_at__lt=today_start).count() + archived_event_count(),
             'events': events,
+            'next_page': next_page,
             'filter_type': filter_type,
             'title': title,
+            'trend': daily_trend(),
         }
         return render(request, "dashboard.html", context)
 
@@ -225,17 +503,27 @@ def dashboard(request):
         if request.method == 'POST' and request.POST.get('action') == 'delete_event':
             event_id = request.POST.get('event_id')
             event = get_object_or_404(Event, id=event_id, organizer=user)
-            event.delete()
+            event.soft_delete()
             messages.success(request, "Event deleted successfully!")
             return redirect('dashboard')
 
         my_events = Event.objects.filter(organizer=user).select_related('category').annotate(
-            rsvp_count=Count('rsvps', filter=Q(rsvps__is_confirmed=True))
-        ).order_by('-date')
+            rsvp_count=count_rsvps(is_confirmed=True)
+        ).order_by('-starts_at')
 
         total_participants = RSVP.objects.filter(event__organizer=user, is_confirmed=True).count()
-        upcoming_events = my_events.filter(date__gte=today)
-        past_events = my_events.filter(date__lt=today)
+        upcoming_events = events_in_window(
+            my_events, today, today + timedelta(days=DEFAULT_WINDOW_DAYS),
+            one_off=my_events.filter(recurrence="NONE", starts_at__gte=today_start)
+        )
+        upcoming_events.reverse()
+        past_events, cursor = past_events_page(
+            my_events.filter(starts_at__lt=today_start),
+            ArchivedEvent.objects.filter(organizer=user).annotate(
+                rsvp_count=count_rsvps(is_confirmed=True)
+            ),
+            parse_past_cursor(request.GET),
+        )
 
         context = {
             'role': 'organizer',
@@ -244,15 +532,22 @@ def dashboard(request):
             'total_events': my_events.count(),
             'upcoming_events': upcoming_events,
             'past_events': past_events,
+            'next_page': past_page_query(cursor),
+            'trend': daily_trend(Event.objects.filter(organizer=user)),
         }
         return render(request, "dashboard.html", context)
 
     # User dashboard
     else:
-        user_rsvps = RSVP.objects.filter(user=user, is_confirmed=True).select_related('event').order_by('-rsvp_date')
+        user_rsvps, cursor = rsvp_history_page(
+            RSVP.objects.filter(user=user, is_confirmed=True).select_related('event'),
+            ArchivedRSVP.objects.filter(user=user, is_confirmed=True).select_related('event'),
+            parse_past_cursor(request.GET),
+        )
         context = {
             'role': 'user',
             'user_rsvps': user_rsvps,
+            'next_page': past_page_query(cursor),
         }
         return render(request, "dashboard.html", context)
 
@@ -280,18 +575,31 @@ def create_event(request):
             use_existing = form.cleaned_data.get('use_existing_category')
 
             if use_existing:
-                saved_event.category = form.cleaned_data.get('existing_category')
+                saved_event.category_id = form.cleaned_data.get('existing_category')
             else:
-                category = Category.objects.create(
-                    name=form.cleaned_data.get('new_category_name'),
-                    description=form.cleaned_data.get('new_category_description', '')
+                category, created = get_or_create_category(
+                    form.cleaned_data.get('new_category_name'),
+                    form.cleaned_data.get('new_category_description', '')
                 )
                 saved_event.category = category
-                messages.success(request, f"Category '{category.name}' created!")
+                if created:
+                    messages.success(request, f"Category '{category.name}' created!")
+                else:
+                    messages.info(request, f"Category '{category.name}' already exists, using it.")
 
             if not event:
                 saved_event.organizer = request.user
             saved_event.save()
+
+            # banner sent beforehand through the chunked upload endpoints
+            upload_id = request.POST.get('upload_id')
+            if upload_id:
+                try:
+                    upload = ChunkedUpload(upload_id)
+                    upload.check_owner(request.user)
+                    upload.attach(saved_event)
+                except UploadError as exc:
+                    messages.error(request, f"The banner could not be attached: {exc}")
             action = 'updated' if event else 'created'
             messages.success(request, f"Event '{saved_event.name}' {action} successfully!")
             return redirect('dashboard')
@@ -7,6 +7,7 @@ django.setup()
 from faker import Faker
 from events.models import Category, Event, RSVP
 from django.contrib.auth.models import User, Group
+from django.utils import timezone
 import random
 
 fake = Faker()
@@ -34,8 +35,7 @@ for _ in range(20):
     Event.objects.create(
         name=fake.catch_phrase(),
         description=fake.text(max_nb_chars=200),
-        date=fake.date_between(start_date='today', end_date='+60d'),
-        time=fake.time(),
+        starts_at=fake.date_time_between(start_date='now', end_date='+60d', tzinfo=timezone.get_current_timezone()),
         location=random.choice(locations),
         category=random.choice(categories),
         image="images/events.jpeg",
@@ -70,7 +70,7 @@ for user in users:
         rsvp, created = RSVP.objects.get_or_create(
             user=user,
             event=event,
-            defaults={'is_confirmed': True} 
+            defaults={'is_confirmed': True, 'confirmed_at': timezone.now()}
         )
         if created:
             rsvp_count += 1
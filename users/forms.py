@@ -77,6 +77,29 @@ class AssignRoleForm(StyleFormMixin, forms.Form):
         self.apply_style_widgets()
 
 
+class BulkUserActionForm(StyleFormMixin, forms.Form):
+    ACTION_CHOICES = [
+        ('assign_role', 'Assign role'),
+        ('deactivate', 'Deactivate'),
+    ]
+    action = forms.ChoiceField(choices=ACTION_CHOICES)
+    role = forms.ModelChoiceField(
+        queryset=Group.objects.all(),
+        required=False,
+        empty_label="Select Role",
+    )
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.apply_style_widgets()
+
+    def clean(self):
+        cleaned_data = super().clean()
+        if cleaned_data.get('action') == 'assign_role' and not cleaned_data.get('role'):
+            raise forms.ValidationError("Please select a role to assign.")
+        return cleaned_data
+
+
 class CreateGroupForm(StyleFormMixin, forms.ModelForm):
     permissions = forms.ModelMultipleChoiceField(
         queryset=Permission.objects.all(),
@@ -0,0 +1,23 @@
+# Generated by Django 6.0.1 on 2026-10-19 10:00
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('users', '0001_initial'),
+    ]
+
+    # auth_user belongs to django.contrib.auth, so the partial index that
+    # purge_stale uses for never-activated accounts is plain SQL
+    operations = [
+        migrations.RunSQL(
+            sql=(
+                "CREATE INDEX user_pending_activation_idx ON auth_user (date_joined) "
+                "WHERE NOT is_active AND last_login IS NULL"
+            ),
+            reverse_sql="DROP INDEX user_pending_activation_idx",
+        ),
+    ]
@@ -1,3 +1,12 @@
 from django.db import models
+from django.contrib.auth.models import User
 
-# Create your models here.
+
+# auth.User can't get a soft-delete flag, so a pending deletion is its own row.
+# The user is deactivated right away and purge_deleted removes it later.
+class UserDeletion(models.Model):
+    user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='deletion')
+    requested_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    def __str__(self):
+        return f"{self.user.username} (deleted {self.requested_at:%d %b %Y})"
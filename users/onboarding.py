@@ -0,0 +1,77 @@
+from itertools import islice
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.contrib.auth.tokens import default_token_generator
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from users.roles import UserGroup, default_group_id
+
+
+def build_activation_email(user):
+    token = default_token_generator.make_token(user)
+    activation_url = f"{settings.FRONTEND_URL}user/activate/{user.id}/{token}/"
+    message = (
+        f"Hi {user.username},\n\n"
+        f"Please activate your account by clicking the link below:\n"
+        f"{activation_url}\n\n"
+        f"Thank you!"
+    )
+    return EmailMessage("Activate your account", message, settings.EMAIL_HOST_USER, [user.email])
+
+
+def _batches(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def onboard_users(rows, batch_size=1000, send_emails=True, active=False):
+    """
+    Create many users without the per-row post_save work.
+
+    `rows` is an iterable of dicts with username, email and optionally
+    first_name, last_name and password. Users are bulk_create'd, their default
+    group membership is bulk-inserted into the through table, and activation
+    emails go out in batches over one SMTP connection. Rows without a password
+    get an unusable one (hashing a real password costs one PBKDF2 run per row).
+    Existing usernames are skipped. Returns (created, skipped).
+    """
+    group_id = default_group_id()
+    created = skipped = 0
+    connection = get_connection(fail_silently=True) if send_emails and not active else None
+    if connection:
+        connection.open()
+    try:
+        for batch in _batches(rows, batch_size):
+            usernames = [row['username'] for row in batch]
+            existing = set(User.objects.filter(username__in=usernames).values_list('username', flat=True))
+            users = []
+            for row in batch:
+                if row['username'] in existing:
+                    skipped += 1
+                    continue
+                existing.add(row['username'])
+                users.append(User(
+                    username=row['username'],
+                    email=row.get('email', ''),
+                    first_name=row.get('first_name', ''),
+                    last_name=row.get('last_name', ''),
+                    password=make_password(row.get('password') or None),
+                    is_active=active,
+                ))
+            # users and their role together: a re-run skips existing usernames, so a user
+            # committed without the membership would never get it
+            with transaction.atomic():
+                users = User.objects.bulk_create(users)
+                UserGroup.objects.bulk_create(
+                    [UserGroup(user_id=user.id, group_id=group_id) for user in users],
+                    ignore_conflicts=True
+                )
+            created += len(users)
+            if connection:
+                connection.send_messages([build_activation_email(user) for user in users if user.email])
+    finally:
+        if connection:
+            connection.close()
+    return created, skipped
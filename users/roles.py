@@ -0,0 +1,58 @@
+from django.contrib.auth.models import Group, User
+from django.db import transaction
+from django.db.models import OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+UserGroup = User.groups.through
+DEFAULT_ROLE = 'User'
+
+# group name -> id, per process; cleared by the Group signals in users/signals.py
+_group_ids = {}
+
+
+def group_id(name):
+    gid = _group_ids.get(name)
+    if gid is None:
+        gid = Group.objects.get_or_create(name=name)[0].id
+        # only remember ids that were committed; a rolled back get_or_create would leave a dangling id
+        transaction.on_commit(lambda: _group_ids.__setitem__(name, gid))
+    return gid
+
+
+def load_group_ids(names):
+    """Remember the ids of the existing groups among `names` with one read; creates nothing."""
+    _group_ids.update(Group.objects.filter(name__in=names).values_list('name', 'id'))
+
+
+def default_group_id():
+    return group_id(DEFAULT_ROLE)
+
+
+def clear_group_ids():
+    _group_ids.clear()
+
+
+def role_name_subquery():
+    """First group name of the outer user, computed in SQL instead of a prefetch."""
+    return Coalesce(
+        Subquery(
+            UserGroup.objects.filter(user_id=OuterRef('pk')).order_by('group__name').values('group__name')[:1]
+        ),
+        Value('No Role Assigned')
+    )
+
+
+def set_user_roles(user_ids, group):
+    """
+    Replace the roles of many users at once: one DELETE and one batched INSERT
+    on the user/group through table inside a single transaction.
+    """
+    user_ids = list(user_ids)
+    with transaction.atomic():
+        UserGroup.objects.filter(user_id__in=user_ids).delete()
+        UserGroup.objects.bulk_create(
+            [UserGroup(user_id=user_id, group_id=group.id) for user_id in user_ids],
+            batch_size=1000
+        )
+    return len(user_ids)
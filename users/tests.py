@@ -1,3 +1,29 @@
+from django.contrib.auth.models import User
+from django.contrib.auth.tokens import default_token_generator
 from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from events.models import Category, Event, RSVP
+from users.models import UserDeletion
 
-# Create your tests here.
+
+class UserDeletionTests(TestCase):
+    def setUp(self):
+        self.event = Event.objects.create(
+            name='Gala', description='', starts_at=timezone.now(),
+            category=Category.objects.create(name='Party', description=''),
+        )
+        self.user = User.objects.create_user('guest', 'guest@example.com', 'pw', is_active=False)
+        RSVP.objects.create(user=self.user, event=self.event, is_confirmed=True)
+        UserDeletion.objects.create(user=self.user)
+
+    def test_old_activation_link_does_not_reactivate(self):
+        token = default_token_generator.make_token(self.user)
+        self.client.get(reverse('activate-user', args=[self.user.id, token]))
+        self.user.refresh_from_db()
+        self.assertFalse(self.user.is_active)
+
+    def test_rsvps_stop_counting_before_the_purge(self):
+        self.assertEqual(self.event.participant_count, 0)
+        response = self.client.get(reverse('api-event-attendees', args=[self.event.id]))
+        self.assertEqual((response.json()['participant_count'], response.json()['rsvp_count']), (0, 0))
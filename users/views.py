@@ -1,11 +1,14 @@
 from django.shortcuts import render, redirect, HttpResponse
 from django.contrib.auth.models import User, Group
 from django.contrib.auth import login, logout, authenticate
-from users.forms import CustomRegistrationForm, LoginForm, AssignRoleForm, CreateGroupForm
+from users.forms import CustomRegistrationForm, LoginForm, AssignRoleForm, CreateGroupForm, BulkUserActionForm
+from users.roles import role_name_subquery, set_user_roles
 from django.contrib import messages
 from django.contrib.auth.tokens import default_token_generator
 from django.contrib.auth.decorators import login_required, user_passes_test
-from django.db.models import Prefetch
+from django.db import transaction
+from django.db.models import Q
+from users.models import UserDeletion
 
 
 def is_admin(user):
@@ -49,7 +52,8 @@ def sign_out(request):
 #ACTIVATE USER 
 def activate_user(request, user_id, token):
     try:
-        user = User.objects.get(id=user_id)
+        # a deleted user's old activation link must not bring the account back
+        user = User.objects.get(id=user_id, deletion__isnull=True)
         if default_token_generator.check_token(user, token):
             user.is_active = True
             user.save()
@@ -62,19 +66,54 @@ def activate_user(request, user_id, token):
 
 
 #USER LIST (Admin only)
+USER_PAGE_SIZE = 50
+
 @user_passes_test(is_admin, login_url='no-permission')
 def user_list(request):
-    users = User.objects.prefetch_related(
-        Prefetch('groups', queryset=Group.objects.all(), to_attr='all_groups')
-    ).all().order_by('username')
-
-    for u in users:
-        if u.all_groups:
-            u.group_name = u.all_groups[0].name
-        else:
-            u.group_name = 'No Role Assigned'
-
-    return render(request, 'admin/user_list.html', {'users': users})
+    if request.method == 'POST':
+        return bulk_user_action(request)
+
+    search_query = request.GET.get('q', '').strip()
+    after = request.GET.get('after', '')
+
+    users = User.objects.filter(deletion__isnull=True).annotate(group_name=role_name_subquery()).only(
+        'id', 'username', 'email', 'is_superuser', 'is_active'
+    ).order_by('username')
+    if search_query:
+        users = users.filter(Q(username__icontains=search_query) | Q(email__icontains=search_query))
+    # keyset pagination on the unique username index
+    if after:
+        users = users.filter(username__gt=after)
+
+    page = list(users[:USER_PAGE_SIZE + 1])
+    next_after = page[USER_PAGE_SIZE - 1].username if len(page) > USER_PAGE_SIZE else None
+
+    return render(request, 'admin/user_list.html', {
+        'users': page[:USER_PAGE_SIZE],
+        'search_query': search_query,
+        'next_after': next_after,
+        'is_first_page': not after,
+        'bulk_form': BulkUserActionForm(),
+    })
+
+
+#BULK ROLE / DEACTIVATE (Admin only)
+def bulk_user_action(request):
+    form = BulkUserActionForm(request.POST)
+    user_ids = [int(value) for value in request.POST.getlist('user_ids') if value.isdigit()]
+    if not user_ids:
+        messages.error(request, "Select at least one user.")
+    elif not form.is_valid():
+        messages.error(request, " ".join(form.non_field_errors()) or "Invalid bulk action.")
+    elif form.cleaned_data['action'] == 'assign_role':
+        role = form.cleaned_data['role']
+        user_ids = User.objects.filter(id__in=user_ids).values_list('id', flat=True)
+        count = set_user_roles(user_ids, role)
+        messages.success(request, f"{count} user(s) have been assigned to '{role.name}' role.")
+    else:
+        count = User.objects.filter(id__in=user_ids, is_superuser=False).exclude(id=request.user.id).update(is_active=False)
+        messages.success(request, f"{count} user(s) deactivated.")
+    return redirect(request.get_full_path())
 
 
 #ASSIGN ROLE (Admin only)
@@ -87,8 +126,7 @@ def assign_role(request, user_id):
         form = AssignRoleForm(request.POST)
         if form.is_valid():
             role = form.cleaned_data.get('role')
-            target_user.groups.clear()
-            target_user.groups.add(role)
+            set_user_roles([target_user.id], role)
             messages.success(request, f"User '{target_user.username}' has been assigned to '{role.name}' role.")
             return redirect('user-list')
 
@@ -134,7 +172,10 @@ def delete_user(request, user_id):
         messages.error(request, "Superuser cannot be deleted.")
         return redirect('user-list')
     
+    # hide and lock out now; purge_deleted removes the user and their RSVPs in chunks
     username = target_user.username
-    target_user.delete()
+    with transaction.atomic():
+        User.objects.filter(pk=target_user.pk).update(is_active=False)
+        UserDeletion.objects.get_or_create(user=target_user)
     messages.success(request, f"User '{username}' deleted successfully.")
     return redirect('user-list')
\ No newline at end of file